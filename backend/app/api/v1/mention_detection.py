@@ -7,12 +7,13 @@
 import asyncio
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from datetime import datetime
 
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.schemas.common import APIResponse
+from app.repositories.mention_repository import encode_check_cursor
 from pydantic import BaseModel
 
 # 引用检测相关的数据模型
@@ -42,6 +43,7 @@ class ModelResult(BaseModel):
     response_text: str
     mentions: List[BrandMention]
     processing_time_ms: int
+    error: Optional[str] = None
 
 class MentionCheckResponse(BaseModel):
     """引用检测响应"""
@@ -236,34 +238,60 @@ async def check_mention(
         )
 
 
-@router.get("/get-history", response_model=APIResponse[HistoryResponse])
+@router.get("/get-history", response_model=APIResponse[HistoryResponse], response_class=ORJSONResponse)
 async def get_history(
     project_id: str,
     page: int = 1,
     limit: int = 20,
     brand: Optional[str] = None,
     model: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     """
     获取检测历史记录
 
-    查询指定项目的历史检测记录。
+    查询指定项目的历史检测记录。传入上一页返回的next_cursor时按游标翻页
+    （此时不再返回page/total/pages），未传入时仍按page分页。
     """
     try:
         # 使用服务获取历史记录
         MentionDetectionService = get_mention_service()
         async with MentionDetectionService() as service:
-            history = await service.repository.get_checks_by_project(
-                project_id=project_id,
-                page=page,
-                limit=limit,
-                brand_filter=brand,
-                model_filter=model
-            )
+            if cursor is not None:
+                try:
+                    history, next_cursor = await service.repository.get_checks_by_cursor(
+                        project_id=project_id,
+                        cursor=cursor,
+                        limit=limit,
+                        brand_filter=brand,
+                        model_filter=model
+                    )
+                except ValueError:
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                pagination = {
+                    "limit": limit,
+                    "next_cursor": next_cursor
+                }
+            else:
+                history = await service.repository.get_checks_by_project(
+                    project_id=project_id,
+                    page=page,
+                    limit=limit,
+                    brand_filter=brand,
+                    model_filter=model
+                )
 
-            # 获取总数
-            total_count = await service.repository.get_checks_count_by_project(project_id)
+                # 获取总数
+                total_count = await service.repository.get_checks_count_by_project(project_id)
+                has_more = bool(history) and page * limit < total_count
+                pagination = {
+                    "page": page,
+                    "limit": limit,
+                    "total": total_count,
+                    "pages": (total_count + limit - 1) // limit,
+                    "next_cursor": encode_check_cursor(history[-1]) if has_more else None
+                }
 
             # 转换为API响应格式
             history_items = []
@@ -284,12 +312,7 @@ async def get_history(
 
             history_response = HistoryResponse(
                 checks=history_items,
-                pagination={
-                    "page": page,
-                    "limit": limit,
-                    "total": total_count,
-                    "pages": (total_count + limit - 1) // limit
-                }
+                pagination=pagination
             )
 
         return APIResponse(
@@ -298,6 +321,8 @@ async def get_history(
             message="获取历史记录成功"
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -324,6 +349,7 @@ async def save_prompt(
             from datetime import datetime
 
             template_id = str(uuid.uuid4())
+            created_at = datetime.now()
             template_data = {
                 "id": template_id,
                 "user_id": current_user.id,
@@ -334,7 +360,7 @@ async def save_prompt(
                 "description": request.description,
                 "usage_count": 0,
                 "is_public": False,
-                "created_at": datetime.now()
+                "created_at": created_at
             }
 
             await service.repository.save_template(template_data)
@@ -346,7 +372,7 @@ async def save_prompt(
                 template=request.template,
                 variables=request.variables or {},
                 usage_count=0,
-                created_at=datetime.now()
+                created_at=created_at
             )
 
         return APIResponse(
@@ -426,7 +452,7 @@ async def get_prompt_templates(
         )
 
 
-@router.get("/analytics/mentions", response_model=APIResponse[AnalyticsResponse])
+@router.get("/analytics/mentions", response_model=APIResponse[AnalyticsResponse], response_class=ORJSONResponse)
 async def get_mention_analytics(
     project_id: str,
     brand: Optional[str] = None,
@@ -485,7 +511,7 @@ async def get_mention_analytics(
         )
 
 
-@router.get("/analytics/compare", response_model=APIResponse[ComparisonResponse])
+@router.get("/analytics/compare", response_model=APIResponse[ComparisonResponse], response_class=ORJSONResponse)
 async def compare_brands(
     project_id: str,
     brands: str,  # 逗号分隔的品牌列表
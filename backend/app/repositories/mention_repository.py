@@ -5,10 +5,11 @@
 """
 
 import json
-from typing import List, Optional, Dict, Any
+import uuid
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, func, update, delete
+from sqlalchemy import select, and_, or_, desc, func, update, delete, case
 from sqlalchemy.orm import selectinload
 
 from app.models.mention import (
@@ -17,6 +18,23 @@ from app.models.mention import (
 )
 
 
+# 品牌统计缓存有效期
+ANALYTICS_CACHE_TTL = timedelta(minutes=10)
+
+
+def encode_check_cursor(check: MentionCheck) -> str:
+    """生成检测记录的分页游标"""
+    return f"{check.created_at.isoformat()}|{check.id}"
+
+
+def decode_check_cursor(cursor: str) -> Tuple[datetime, str]:
+    """解析分页游标，格式错误时抛出ValueError"""
+    created_at, sep, check_id = cursor.partition("|")
+    if not sep or not check_id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return datetime.fromisoformat(created_at), check_id
+
+
 class MentionRepository:
     """引用检测数据访问层"""
     
@@ -26,10 +44,16 @@ class MentionRepository:
     # ==================== MentionCheck 操作 ====================
     
     async def create_check(self, check_data: Dict[str, Any]) -> MentionCheck:
-        """创建引用检测记录"""
+        """创建引用检测记录
+
+        created_at 在Python侧补齐：SQLite上func.now()默认值只有秒级精度且不带小数部分，
+        与游标中绑定的带微秒时间比较时顺序不一致，会导致游标分页无法前进。
+        """
+        check_data = {"created_at": datetime.utcnow(), **check_data}
         check = MentionCheck(**check_data)
         self.db.add(check)
         await self.db.flush()  # 只flush，不commit
+        await self.invalidate_project_analytics(check.project_id)
         return check
     
     async def get_check_by_id(self, check_id: str) -> Optional[MentionCheck]:
@@ -41,16 +65,14 @@ class MentionRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_checks_by_project(
-        self, 
-        project_id: str, 
-        page: int = 1, 
-        limit: int = 20,
+    def _checks_query(
+        self,
+        project_id: str,
         brand_filter: Optional[str] = None,
         model_filter: Optional[str] = None,
         status_filter: Optional[str] = None
-    ) -> List[MentionCheck]:
-        """获取项目的检测记录"""
+    ):
+        """构建项目检测记录查询（按created_at、id倒序，保证同一时间戳内顺序稳定）"""
         query = select(MentionCheck).where(MentionCheck.project_id == project_id)
         
         # 应用过滤器
@@ -63,13 +85,62 @@ class MentionRepository:
         if status_filter:
             query = query.where(MentionCheck.status == status_filter)
         
-        # 排序和分页
-        query = query.order_by(desc(MentionCheck.created_at))
+        return query.order_by(desc(MentionCheck.created_at), desc(MentionCheck.id))
+    
+    async def get_checks_by_project(
+        self, 
+        project_id: str, 
+        page: int = 1, 
+        limit: int = 20,
+        brand_filter: Optional[str] = None,
+        model_filter: Optional[str] = None,
+        status_filter: Optional[str] = None
+    ) -> List[MentionCheck]:
+        """获取项目的检测记录"""
+        query = self._checks_query(project_id, brand_filter, model_filter, status_filter)
         query = query.offset((page - 1) * limit).limit(limit)
         
         result = await self.db.execute(query)
         return result.scalars().all()
     
+    async def get_checks_by_cursor(
+        self,
+        project_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        brand_filter: Optional[str] = None,
+        model_filter: Optional[str] = None,
+        status_filter: Optional[str] = None
+    ) -> Tuple[List[MentionCheck], Optional[str]]:
+        """按游标获取项目的检测记录（键集分页）
+
+        游标为上一页最后一条记录的 (created_at, id)，通过 encode_check_cursor 生成。
+        created_at 可能重复，因此以 id 作为次序键，避免跳过同一时间戳的记录。
+        多取一条判断是否还有下一页，最后一页不返回游标。
+
+        Returns:
+            (检测记录列表, 下一页游标)
+        """
+        query = self._checks_query(project_id, brand_filter, model_filter, status_filter)
+        if cursor is not None:
+            cursor_created_at, cursor_id = decode_check_cursor(cursor)
+            query = query.where(or_(
+                MentionCheck.created_at < cursor_created_at,
+                and_(
+                    MentionCheck.created_at == cursor_created_at,
+                    MentionCheck.id < cursor_id
+                )
+            ))
+        query = query.limit(limit + 1)
+        
+        result = await self.db.execute(query)
+        checks = result.scalars().all()
+        
+        if len(checks) > limit:
+            checks = checks[:limit]
+            return checks, encode_check_cursor(checks[-1])
+        return checks, None
+    
     async def update_check_status(
         self, 
         check_id: str, 
@@ -96,6 +167,13 @@ class MentionRepository:
             .where(MentionCheck.id == check_id)
             .values(**update_data)
         )
+        
+        # 检测结果变化后，项目的品牌统计缓存随之失效
+        if result.rowcount > 0:
+            await self._delete_brand_stats(AnalyticsCache.project_id.in_(
+                select(MentionCheck.project_id).where(MentionCheck.id == check_id)
+            ))
+        
         await self.db.commit()
         return result.rowcount > 0
     
@@ -149,7 +227,25 @@ class MentionRepository:
         brand: str, 
         days: int = 30
     ) -> Dict[str, Any]:
-        """获取品牌提及统计"""
+        """获取品牌提及统计，优先读取analytics_cache中未过期的结果"""
+        cache_key = f"brand_stats:{project_id}:{brand}:{days}d"
+        cached = await self.get_cached_analytics(cache_key)
+        if cached is not None:
+            return cached
+        
+        stats = await self._compute_brand_mention_stats(project_id, brand, days)
+        await self.set_cached_analytics(
+            cache_key, stats, project_id=project_id, brand=brand, timeframe=f"{days}d"
+        )
+        return stats
+    
+    async def _compute_brand_mention_stats(
+        self, 
+        project_id: str, 
+        brand: str, 
+        days: int = 30
+    ) -> Dict[str, Any]:
+        """基于明细表聚合品牌提及统计"""
         since_date = datetime.utcnow() - timedelta(days=days)
         
         # 总检测次数
@@ -213,21 +309,141 @@ class MentionRepository:
         brands: List[str], 
         days: int = 30
     ) -> List[Dict[str, Any]]:
-        """获取多品牌对比统计"""
-        comparison_data = []
+        """获取多品牌对比统计
+
+        同一会话上的查询无法并发执行，这里把逐品牌的3次查询合并为
+        两条聚合查询：一次统计各品牌的检测次数，一次按品牌分组统计提及。
+        """
+        if not brands:
+            return []
+        
+        since_date = datetime.utcnow() - timedelta(days=days)
+        
+        # 各品牌的总检测次数
+        checks_result = await self.db.execute(
+            select(*[
+                func.sum(case((MentionCheck.brands_checked.contains(brand), 1), else_=0))
+                for brand in brands
+            ])
+            .where(
+                and_(
+                    MentionCheck.project_id == project_id,
+                    MentionCheck.created_at >= since_date
+                )
+            )
+        )
+        checks_row = checks_result.one()
+        total_checks_by_brand = {
+            brand: int(count or 0) for brand, count in zip(brands, checks_row)
+        }
+        
+        # 各品牌的提及次数与平均置信度
+        mentions_result = await self.db.execute(
+            select(
+                BrandMention.brand,
+                func.count(BrandMention.id),
+                func.avg(BrandMention.confidence_score)
+            )
+            .join(MentionResult, BrandMention.result_id == MentionResult.id)
+            .join(MentionCheck, MentionResult.check_id == MentionCheck.id)
+            .where(
+                and_(
+                    MentionCheck.project_id == project_id,
+                    BrandMention.brand.in_(brands),
+                    BrandMention.mentioned == True,
+                    MentionCheck.created_at >= since_date
+                )
+            )
+            .group_by(BrandMention.brand)
+        )
+        mention_stats = {
+            brand: (total_mentions, avg_confidence)
+            for brand, total_mentions, avg_confidence in mentions_result.all()
+        }
         
+        comparison_data = []
         for brand in brands:
-            stats = await self.get_brand_mention_stats(project_id, brand, days)
+            total_checks = total_checks_by_brand[brand]
+            total_mentions, avg_confidence = mention_stats.get(brand, (0, None))
             comparison_data.append({
                 "brand": brand,
-                "mention_rate": stats["mention_rate"],
-                "avg_confidence": stats["avg_confidence"],
-                "total_mentions": stats["total_mentions"],
-                "total_checks": stats["total_checks"]
+                "mention_rate": total_mentions / total_checks if total_checks > 0 else 0.0,
+                "avg_confidence": float(avg_confidence or 0.0),
+                "total_mentions": total_mentions,
+                "total_checks": total_checks
             })
         
         return comparison_data
     
+    # ==================== AnalyticsCache 操作 ====================
+    
+    async def get_cached_analytics(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取未过期的统计缓存"""
+        result = await self.db.execute(
+            select(AnalyticsCache.data).where(
+                and_(
+                    AnalyticsCache.cache_key == cache_key,
+                    AnalyticsCache.expires_at > datetime.utcnow()
+                )
+            )
+        )
+        data = result.scalar_one_or_none()
+        return json.loads(data) if data else None
+    
+    async def set_cached_analytics(
+        self,
+        cache_key: str,
+        data: Dict[str, Any],
+        project_id: Optional[str] = None,
+        brand: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        ttl: timedelta = ANALYTICS_CACHE_TTL
+    ) -> None:
+        """写入或刷新统计缓存
+
+        使用单条 INSERT ... ON CONFLICT DO UPDATE，并发请求同时未命中时
+        后写入的一方覆盖缓存内容，而不是触发cache_key唯一约束错误。
+        """
+        values = {
+            "data": json.dumps(data),
+            "expires_at": datetime.utcnow() + ttl
+        }
+        statement = self._dialect_insert(AnalyticsCache).values(
+            id=str(uuid.uuid4()),
+            cache_key=cache_key,
+            project_id=project_id,
+            brand=brand,
+            timeframe=timeframe,
+            **values
+        )
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[AnalyticsCache.cache_key],
+            set_=values
+        ))
+    
+    async def invalidate_project_analytics(self, project_id: str) -> None:
+        """清除项目的品牌统计缓存（检测记录新增或状态变化后调用）"""
+        await self._delete_brand_stats(AnalyticsCache.project_id == project_id)
+    
+    async def _delete_brand_stats(self, project_condition) -> None:
+        """删除满足项目条件的品牌统计缓存"""
+        await self.db.execute(
+            delete(AnalyticsCache).where(
+                and_(
+                    project_condition,
+                    AnalyticsCache.cache_key.startswith("brand_stats:")
+                )
+            )
+        )
+    
+    def _dialect_insert(self, table):
+        """按当前数据库方言选择支持 ON CONFLICT 的 insert 构造"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(table)
+    
     # ==================== PromptTemplate 操作 ====================
     
     async def save_template(self, template_data: Dict[str, Any]) -> PromptTemplate:
@@ -4,10 +4,20 @@
 """
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=128)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Tuple["re.Pattern", ...]:
+    """编译一组正则模式，相同模式组在所有检测器实例间共享"""
+    return tuple(re.compile(pattern) for pattern in patterns)
+
+
 @dataclass
 class BrandMention:
     """品牌提及结果"""
@@ -70,6 +80,12 @@ class ImprovedBrandDetector:
                 r"网状.*思维", r"关联.*思考"
             ]
         }
+        
+        # 预编译隐式匹配模式，编译结果按模式组缓存，新建检测器无需重新编译
+        self._implicit_regexes = {
+            brand: _compile_patterns(tuple(patterns))
+            for brand, patterns in self.implicit_patterns.items()
+        }
     
     def detect_brand_mentions(self, text: str, target_brands: List[str]) -> Dict[str, BrandMention]:
         """
@@ -84,21 +100,32 @@ class ImprovedBrandDetector:
         """
         results = {}
         text_lower = text.lower()
+        # 搜索词 -> 匹配位置，同一文本中相同的品牌名/变体只扫描一次
+        match_table = {}
         
         for brand in target_brands:
-            mention = self._detect_single_brand(text, text_lower, brand)
+            mention = self._detect_single_brand(text, text_lower, brand, match_table)
             results[brand] = mention
         
         return results
     
-    def _detect_single_brand(self, original_text: str, text_lower: str, brand: str) -> BrandMention:
+    def _detect_single_brand(
+        self,
+        original_text: str,
+        text_lower: str,
+        brand: str,
+        match_table: Optional[Dict[str, List[int]]] = None
+    ) -> BrandMention:
         """检测单个品牌的提及"""
+        if match_table is None:
+            match_table = {}
         positions = []
         contexts = []
         mention_types = []
+        implicit_count = 0
         
         # 1. 精确匹配
-        exact_positions = self._find_exact_matches(text_lower, brand)
+        exact_positions = self._lookup_matches(text_lower, brand, match_table)
         if exact_positions:
             positions.extend(exact_positions)
             mention_types.append('exact')
@@ -107,7 +134,7 @@ class ImprovedBrandDetector:
         # 2. 变体匹配
         if brand in self.brand_variants:
             for variant in self.brand_variants[brand]:
-                variant_positions = self._find_exact_matches(text_lower, variant)
+                variant_positions = self._lookup_matches(text_lower, variant, match_table)
                 if variant_positions:
                     positions.extend(variant_positions)
                     mention_types.append('variant')
@@ -119,9 +146,10 @@ class ImprovedBrandDetector:
             if implicit_matches:
                 mention_types.append('implicit')
                 contexts.extend(implicit_matches)
+                implicit_count = len(implicit_matches)
         
         # 计算置信度
-        confidence = self._calculate_confidence(positions, mention_types, contexts)
+        confidence = self._calculate_confidence(positions, mention_types, contexts, implicit_count)
         
         # 去重和排序
         positions = sorted(list(set(positions)))
@@ -136,10 +164,30 @@ class ImprovedBrandDetector:
             mention_type=','.join(set(mention_types)) if mention_types else 'none'
         )
     
+    def _lookup_matches(
+        self,
+        text_lower: str,
+        search_term: str,
+        match_table: Dict[str, List[int]]
+    ) -> List[int]:
+        """查找精确匹配位置，复用同一文本中已扫描过的搜索词结果"""
+        key = search_term.lower()
+        positions = match_table.get(key)
+        if positions is None:
+            positions = self._scan_matches(text_lower, key)
+            match_table[key] = positions
+        return positions
+    
     def _find_exact_matches(self, text_lower: str, search_term: str) -> List[int]:
         """查找精确匹配的位置"""
+        return self._scan_matches(text_lower, search_term.lower())
+    
+    def _scan_matches(self, text_lower: str, search_lower: str) -> List[int]:
+        """在小写文本中扫描已小写化的搜索词"""
         positions = []
-        search_lower = search_term.lower()
+        # 搜索词比文本还长时不可能匹配，跳过扫描
+        if len(search_lower) > len(text_lower):
+            return positions
         start = 0
 
         while True:
@@ -178,18 +226,17 @@ class ImprovedBrandDetector:
         """查找隐式匹配"""
         matches = []
         
-        if brand not in self.implicit_patterns:
+        if brand not in self._implicit_regexes:
             return matches
         
-        for pattern in self.implicit_patterns[brand]:
-            if re.search(pattern, text_lower):
-                # 提取匹配的上下文
-                match = re.search(pattern, text_lower)
-                if match:
-                    start = max(0, match.start() - 20)
-                    end = min(len(text_lower), match.end() + 20)
-                    context = text_lower[start:end].strip()
-                    matches.append(f"隐式匹配: {context}")
+        for regex in self._implicit_regexes[brand]:
+            # 提取匹配的上下文
+            match = regex.search(text_lower)
+            if match:
+                start = max(0, match.start() - 20)
+                end = min(len(text_lower), match.end() + 20)
+                context = text_lower[start:end].strip()
+                matches.append(f"隐式匹配: {context}")
         
         return matches
     
@@ -204,13 +251,22 @@ class ImprovedBrandDetector:
             context = text[start:end].strip()
             
             # 清理上下文
-            context = re.sub(r'\s+', ' ', context)
+            context = _WHITESPACE_RE.sub(' ', context)
             contexts.append(context)
         
         return contexts
     
-    def _calculate_confidence(self, positions: List[int], mention_types: List[str], contexts: List[str]) -> float:
-        """计算置信度"""
+    def _calculate_confidence(
+        self,
+        positions: List[int],
+        mention_types: List[str],
+        contexts: List[str],
+        implicit_count: Optional[int] = None
+    ) -> float:
+        """计算置信度
+
+        implicit_count 为调用方已知的隐式匹配数量，未提供时从上下文中统计。
+        """
         if not positions and not contexts:
             return 0.0
         
@@ -229,13 +285,15 @@ class ImprovedBrandDetector:
             confidence += 0.1
         
         # 根据提及次数调整
-        mention_count = len(positions) + len([c for c in contexts if '隐式匹配' in c])
+        if implicit_count is None:
+            implicit_count = sum('隐式匹配' in c for c in contexts)
+        mention_count = len(positions) + implicit_count
         if mention_count > 1:
             confidence += min(0.2, mention_count * 0.05)
         
         # 根据上下文质量调整
         if contexts:
-            avg_context_length = sum(len(c) for c in contexts) / len(contexts)
+            avg_context_length = sum(map(len, contexts)) / len(contexts)
             if avg_context_length > 30:  # 有足够的上下文
                 confidence += 0.1
         
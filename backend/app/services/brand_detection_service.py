@@ -4,6 +4,7 @@
 """
 
 from abc import ABC, abstractmethod
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -56,11 +57,10 @@ class SimpleBrandDetector(BrandDetector):
         text_lower = text.lower()
         
         for brand in brands:
-            brand_lower = brand.lower()
-            mentioned = brand_lower in text_lower
+            # 一次find同时判断是否提及并获得位置
+            pos = text_lower.find(brand.lower())
             
-            if mentioned:
-                pos = text_lower.find(brand_lower)
+            if pos != -1:
                 context = text[max(0, pos-50):min(len(text), pos+len(brand)+50)]
                 
                 results[brand] = BrandDetectionResult(
@@ -245,13 +245,10 @@ class BrandDetectionService(BaseService):
             统计信息
         """
         total_brands = len(results)
-        mentioned_brands = sum(1 for r in results.values() if r.mentioned)
+        mentioned_brands = sum(r.mentioned for r in results.values())
         avg_confidence = sum(r.confidence for r in results.values()) / total_brands if total_brands > 0 else 0
         
-        detection_methods = {}
-        for result in results.values():
-            method = result.detection_method
-            detection_methods[method] = detection_methods.get(method, 0) + 1
+        detection_methods = dict(Counter(r.detection_method for r in results.values()))
         
         return {
             "total_brands": total_brands,
@@ -4,8 +4,10 @@
 """
 
 import asyncio
+import time
 import uuid
 import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -15,7 +17,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.services.base import BusinessService
-from app.services.ai import AIServiceFactory, AIMessage, AIRole
+from app.services.ai import AIServiceFactory, AIMessage, AIRole, AIResponse
 from app.services.brand_detection import ImprovedBrandDetector
 from app.models.mention import create_mention_check, create_mention_result, create_brand_mention
 from app.api.v1.mention_detection import (
@@ -24,6 +26,11 @@ from app.api.v1.mention_detection import (
 )
 
 
+# 模型响应缓存: (提供商, 模型, prompt, max_tokens, temperature) -> (写入时间, 响应)
+_RESPONSE_CACHE_MAXSIZE = 256
+_response_cache: "OrderedDict[tuple, tuple[float, AIResponse]]" = OrderedDict()
+
+
 @dataclass
 class MentionDetectionConfig:
     """引用检测配置"""
@@ -33,6 +40,8 @@ class MentionDetectionConfig:
     temperature: float = 0.3
     timeout: int = 30
     parallel_execution: bool = True
+    max_concurrency: int = 5
+    response_cache_ttl: int = 0  # 相同请求的响应复用时间(秒)，0表示不缓存
 
 
 class MentionDetectionService:
@@ -144,10 +153,11 @@ class MentionDetectionService:
             summary = self._calculate_summary(model_results, brands, config.models)
             
             # 4. 更新检测记录
+            completed_at = datetime.now()
             await self.repository.update_check_status(
                 check_id=check_id,
                 status="completed",
-                completed_at=datetime.now(),
+                completed_at=completed_at,
                 total_mentions=summary["total_mentions"],
                 mention_rate=summary["mention_rate"],
                 avg_confidence=summary["avg_confidence"]
@@ -161,7 +171,7 @@ class MentionDetectionService:
                 results=model_results,
                 summary=summary,
                 created_at=start_time,
-                completed_at=datetime.now()
+                completed_at=completed_at
             )
             
         except Exception as e:
@@ -177,10 +187,16 @@ class MentionDetectionService:
         config: MentionDetectionConfig
     ) -> List[ModelResult]:
         """并行执行多个AI模型"""
-        tasks = [
-            self._process_single_model(check_id, model, prompt, brands, config)
-            for model in config.models
-        ]
+        # 限制同时进行的模型调用数量，避免触发提供商限流
+        semaphore = asyncio.Semaphore(max(1, config.max_concurrency))
+
+        async def run_model(model: str) -> ModelResult:
+            async with semaphore:
+                return await self._process_single_model(
+                    check_id, model, prompt, brands, config
+                )
+
+        tasks = [run_model(model) for model in config.models]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -188,12 +204,7 @@ class MentionDetectionService:
         model_results = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                model_results.append(ModelResult(
-                    model=config.models[i],
-                    response_text=f"Error: {str(result)}",
-                    mentions=[],
-                    processing_time_ms=0
-                ))
+                model_results.append(self._error_result(config.models[i], result))
             else:
                 model_results.append(result)
         
@@ -216,15 +227,20 @@ class MentionDetectionService:
                 )
                 model_results.append(result)
             except Exception as e:
-                model_results.append(ModelResult(
-                    model=model,
-                    response_text=f"Error: {str(e)}",
-                    mentions=[],
-                    processing_time_ms=0
-                ))
+                model_results.append(self._error_result(model, e))
         
         return model_results
     
+    def _error_result(self, model: str, error: Exception) -> ModelResult:
+        """构造模型调用失败的结果，错误信息通过error字段单独返回"""
+        return ModelResult(
+            model=model,
+            response_text=f"Error: {str(error)}",
+            mentions=[],
+            processing_time_ms=0,
+            error=str(error)
+        )
+    
     async def _process_single_model(
         self,
         check_id: str,
@@ -234,7 +250,7 @@ class MentionDetectionService:
         config: MentionDetectionConfig
     ) -> ModelResult:
         """处理单个AI模型"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         result_id = str(uuid.uuid4())
         
         try:
@@ -247,15 +263,9 @@ class MentionDetectionService:
             model_id = self._model_mapping.get(model_name, model_name)
             
             # 执行AI调用
-            messages = [AIMessage(role=AIRole.USER, content=prompt)]
-            response = await provider.chat_completion(
-                messages=messages,
-                model=model_id,
-                max_tokens=config.max_tokens,
-                temperature=config.temperature
-            )
+            response = await self._get_model_response(provider, model_id, prompt, config)
             
-            processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             # 保存模型结果
             result_data = {
@@ -295,7 +305,7 @@ class MentionDetectionService:
             )
             
         except Exception as e:
-            processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             # 保存错误结果
             result_data = {
@@ -310,11 +320,47 @@ class MentionDetectionService:
             
             raise e
     
+    async def _get_model_response(
+        self,
+        provider,
+        model_id: str,
+        prompt: str,
+        config: MentionDetectionConfig
+    ) -> AIResponse:
+        """调用AI模型，按配置复用有效期内相同请求的响应"""
+        ttl = config.response_cache_ttl
+        cache_key = (provider.provider_name, model_id, prompt, config.max_tokens, config.temperature)
+
+        if ttl > 0:
+            cached = _response_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                _response_cache.move_to_end(cache_key)
+                return cached[1]
+
+        messages = [AIMessage(role=AIRole.USER, content=prompt)]
+        response = await provider.chat_completion(
+            messages=messages,
+            model=model_id,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature
+        )
+
+        if ttl > 0:
+            _response_cache[cache_key] = (time.monotonic(), response)
+            _response_cache.move_to_end(cache_key)
+            while len(_response_cache) > _RESPONSE_CACHE_MAXSIZE:
+                _response_cache.popitem(last=False)
+
+        return response
+
     def _convert_to_api_format(self, brand_analysis: Dict) -> List[BrandMention]:
-        """转换品牌分析结果为API格式"""
+        """转换品牌分析结果为API格式
+
+        检测器输出的字段类型已确定，使用model_construct跳过重复校验。
+        """
         mentions = []
         for brand, analysis in brand_analysis.items():
-            mentions.append(BrandMention(
+            mentions.append(BrandMention.model_construct(
                 brand=brand,
                 mentioned=analysis.mentioned,
                 confidence_score=analysis.confidence,
@@ -330,33 +376,22 @@ class MentionDetectionService:
         models: List[str]
     ) -> Dict[str, Any]:
         """计算汇总统计"""
-        total_mentions = sum(
-            len([m for m in result.mentions if m.mentioned])
-            for result in model_results
-        )
+        # 单次遍历收集所有已提及的品牌与置信度
+        brands_mentioned = set()
+        all_confidences = []
+        for result in model_results:
+            for mention in result.mentions:
+                if mention.mentioned:
+                    brands_mentioned.add(mention.brand)
+                    all_confidences.append(mention.confidence_score)
         
+        total_mentions = len(all_confidences)
         mention_rate = total_mentions / (len(brands) * len(models)) if brands and models else 0
-        
-        brands_mentioned = list(set([
-            mention.brand
-            for result in model_results
-            for mention in result.mentions
-            if mention.mentioned
-        ]))
-        
-        avg_confidence = 0
-        if total_mentions > 0:
-            all_confidences = [
-                mention.confidence_score
-                for result in model_results
-                for mention in result.mentions
-                if mention.mentioned
-            ]
-            avg_confidence = sum(all_confidences) / len(all_confidences)
+        avg_confidence = sum(all_confidences) / total_mentions if total_mentions > 0 else 0
         
         return {
             "total_mentions": total_mentions,
-            "brands_mentioned": brands_mentioned,
+            "brands_mentioned": list(brands_mentioned),
             "mention_rate": round(mention_rate, 4),
             "avg_confidence": round(avg_confidence, 4)
         }
@@ -8,67 +8,69 @@ import pytest
 from app.services.mention_detection import MentionDetectionService
 
 
+@pytest.fixture(scope="module")
+def service():
+    """模块内共享的引用检测服务实例"""
+    return MentionDetectionService()
+
+
 class TestMentionAlgorithmAccuracy:
     """引用检测算法准确率测试"""
     
-    def setup_method(self):
-        """设置测试环境"""
-        self.service = MentionDetectionService()
+    # 准确率测试数据集
+    test_cases = [
+        # 精确匹配测试
+        {
+            "text": "我推荐使用Notion作为团队协作工具",
+            "brands": ["Notion", "Obsidian"],
+            "expected": {"Notion": True, "Obsidian": False}
+        },
+        {
+            "text": "Obsidian是一个很好的笔记软件",
+            "brands": ["Notion", "Obsidian"],
+            "expected": {"Notion": False, "Obsidian": True}
+        },
+        
+        # 大小写不敏感测试
+        {
+            "text": "我觉得notion是个不错的选择",
+            "brands": ["Notion"],
+            "expected": {"Notion": True}
+        },
+        {
+            "text": "OBSIDIAN功能很强大",
+            "brands": ["Obsidian"],
+            "expected": {"Obsidian": True}
+        },
+        
+        # 多品牌提及测试
+        {
+            "text": "对比Notion、Obsidian和Roam Research这三个工具",
+            "brands": ["Notion", "Obsidian", "Roam Research"],
+            "expected": {"Notion": True, "Obsidian": True, "Roam Research": True}
+        },
+        
+        # 否定测试
+        {
+            "text": "我从来没有使用过任何笔记软件",
+            "brands": ["Notion", "Obsidian"],
+            "expected": {"Notion": False, "Obsidian": False}
+        },
+        {
+            "text": "这个工具很好用，推荐给大家",
+            "brands": ["Notion"],
+            "expected": {"Notion": False}
+        },
         
-        # 准确率测试数据集
-        self.test_cases = [
-            # 精确匹配测试
-            {
-                "text": "我推荐使用Notion作为团队协作工具",
-                "brands": ["Notion", "Obsidian"],
-                "expected": {"Notion": True, "Obsidian": False}
-            },
-            {
-                "text": "Obsidian是一个很好的笔记软件",
-                "brands": ["Notion", "Obsidian"],
-                "expected": {"Notion": False, "Obsidian": True}
-            },
-            
-            # 大小写不敏感测试
-            {
-                "text": "我觉得notion是个不错的选择",
-                "brands": ["Notion"],
-                "expected": {"Notion": True}
-            },
-            {
-                "text": "OBSIDIAN功能很强大",
-                "brands": ["Obsidian"],
-                "expected": {"Obsidian": True}
-            },
-            
-            # 多品牌提及测试
-            {
-                "text": "对比Notion、Obsidian和Roam Research这三个工具",
-                "brands": ["Notion", "Obsidian", "Roam Research"],
-                "expected": {"Notion": True, "Obsidian": True, "Roam Research": True}
-            },
-            
-            # 否定测试
-            {
-                "text": "我从来没有使用过任何笔记软件",
-                "brands": ["Notion", "Obsidian"],
-                "expected": {"Notion": False, "Obsidian": False}
-            },
-            {
-                "text": "这个工具很好用，推荐给大家",
-                "brands": ["Notion"],
-                "expected": {"Notion": False}
-            },
-            
-            # 空文本测试
-            {
-                "text": "",
-                "brands": ["Notion"],
-                "expected": {"Notion": False}
-            }
-        ]
+        # 空文本测试
+        {
+            "text": "",
+            "brands": ["Notion"],
+            "expected": {"Notion": False}
+        }
+    ]
     
-    def test_algorithm_accuracy(self):
+    def test_algorithm_accuracy(self, service):
         """测试算法整体准确率"""
         correct_predictions = 0
         total_predictions = 0
@@ -77,7 +79,7 @@ class TestMentionAlgorithmAccuracy:
         for i, case in enumerate(self.test_cases):
             try:
                 # 执行引用检测
-                mentions = self.service._analyze_mentions(case["text"], case["brands"])
+                mentions = service._analyze_mentions(case["text"], case["brands"])
                 
                 # 检查每个品牌的预测结果
                 for mention in mentions:
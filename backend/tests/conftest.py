@@ -7,7 +7,7 @@ import pytest_asyncio
 import asyncio
 from typing import Generator, AsyncGenerator
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -26,9 +26,9 @@ from app.schemas.user import UserCreate
 from app.schemas.project import ProjectCreate
 
 
-# Test database URLs
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# Test database URLs (in-memory; StaticPool keeps a single shared connection)
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
 
 # Create test engines
 engine = create_engine(
@@ -43,6 +43,18 @@ async_engine = create_async_engine(
     poolclass=StaticPool,
 )
 
+
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transaction_handling(dbapi_connection, connection_record):
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work under pysqlite."""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_sqlite_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 AsyncTestingSessionLocal = sessionmaker(
     async_engine,
@@ -59,6 +71,17 @@ def db_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Use the minimum bcrypt cost in tests; hashing dominates user fixtures."""
+    from app.core import security
+
+    original_context = security.pwd_context
+    security.pwd_context = original_context.copy(bcrypt__rounds=4)
+    yield
+    security.pwd_context = original_context
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -80,10 +103,16 @@ async def async_db_engine():
 
 @pytest.fixture
 def db_session(db_engine):
-    """Create test database session."""
+    """
+    Create test database session.
+
+    The schema is built once per session by ``db_engine``. Each test runs
+    inside an outer transaction; session commits and rollbacks only touch a
+    SAVEPOINT, and the outer transaction is rolled back on teardown.
+    """
     connection = db_engine.connect()
     transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
 
     yield session
 
@@ -144,6 +173,14 @@ def test_user(db_session, auth_service, test_user_data):
     return user
 
 
+@pytest.fixture
+def another_user(db_session, auth_service):
+    """Create a second user for ownership/isolation tests."""
+    return auth_service.create_user(
+        UserFactory.create_user_data(email="another@example.com")
+    )
+
+
 @pytest.fixture
 def test_superuser_data():
     """Test superuser data."""
@@ -7,9 +7,11 @@
 import pytest
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import select
 from app.repositories.mention_repository import MentionRepository
-from app.models.mention import MentionCheck, MentionResult, BrandMention, PromptTemplate
+from app.models.mention import MentionCheck, MentionResult, BrandMention, PromptTemplate, AnalyticsCache
 
 
 class TestMentionRepository:
@@ -134,6 +136,81 @@ class TestMentionRepository:
         checks_page2 = await repo.get_checks_by_project(project_id, page=2, limit=2)
         assert len(checks_page2) == 1
     
+    @pytest.mark.asyncio
+    async def test_get_checks_by_cursor(self, async_db_session):
+        """测试按游标分页获取检测记录（含相同created_at的记录）"""
+        repo = MentionRepository(async_db_session)
+        
+        # 前4条记录共享同一时间戳，模拟SQLite秒级精度下的同秒写入
+        project_id = str(uuid.uuid4())
+        same_second = datetime(2024, 1, 1, 12, 0, 0)
+        created_times = [same_second] * 4 + [same_second - timedelta(seconds=1)] * 2
+        for i, created_at in enumerate(created_times):
+            await repo.create_check({
+                "id": str(uuid.uuid4()),
+                "project_id": project_id,
+                "user_id": str(uuid.uuid4()),
+                "prompt": f"测试Prompt {i}",
+                "brands_checked": json.dumps(["Brand1"]),
+                "models_used": json.dumps(["doubao"]),
+                "status": "completed",
+                "created_at": created_at
+            })
+        
+        expected = await repo.get_checks_by_project(project_id, page=1, limit=10)
+        
+        # 逐页翻到底：每条记录恰好出现一次，顺序与偏移分页一致
+        seen = []
+        pages = 0
+        cursor = None
+        while True:
+            checks, cursor = await repo.get_checks_by_cursor(project_id, cursor=cursor, limit=2)
+            pages += 1
+            seen.extend(check.id for check in checks)
+            if cursor is None:
+                break
+        
+        assert seen == [check.id for check in expected]
+        assert len(seen) == 6
+        # 记录数恰好是limit的整数倍时，最后一页不再返回游标，不会多出空页
+        assert pages == 3
+        
+        # 游标格式错误
+        with pytest.raises(ValueError):
+            await repo.get_checks_by_cursor(project_id, cursor="not-a-cursor")
+    
+    @pytest.mark.asyncio
+    async def test_get_checks_by_cursor_default_created_at(self, async_db_session):
+        """测试未显式指定created_at的记录也能按游标翻页"""
+        repo = MentionRepository(async_db_session)
+        
+        project_id = str(uuid.uuid4())
+        for i in range(5):
+            await repo.create_check({
+                "id": str(uuid.uuid4()),
+                "project_id": project_id,
+                "user_id": str(uuid.uuid4()),
+                "prompt": f"测试Prompt {i}",
+                "brands_checked": json.dumps(["Brand1"]),
+                "models_used": json.dumps(["doubao"]),
+                "status": "completed"
+            })
+        
+        expected = await repo.get_checks_by_project(project_id, page=1, limit=10)
+        
+        # 限制翻页次数，游标不前进时测试失败而不是死循环
+        seen = []
+        cursor = None
+        for _ in range(10):
+            checks, cursor = await repo.get_checks_by_cursor(project_id, cursor=cursor, limit=2)
+            seen.extend(check.id for check in checks)
+            if cursor is None:
+                break
+        
+        assert cursor is None
+        assert seen == [check.id for check in expected]
+        assert len(seen) == 5
+    
     @pytest.mark.asyncio
     async def test_update_check_status(self, async_db_session):
         """测试更新检测记录状态"""
@@ -323,3 +400,91 @@ class TestMentionRepository:
         assert brand_a_stats["avg_confidence"] == 0.8
         assert brand_b_stats["mention_rate"] == 1.0
         assert brand_b_stats["avg_confidence"] == 0.9
+
+
+class TestAnalyticsCache:
+    """测试品牌统计缓存"""
+    
+    async def _create_check(self, repo, project_id, status="completed"):
+        """创建一条检测记录"""
+        return await repo.create_check({
+            "id": str(uuid.uuid4()),
+            "project_id": project_id,
+            "user_id": str(uuid.uuid4()),
+            "prompt": "推荐工具",
+            "brands_checked": json.dumps(["TestBrand"]),
+            "models_used": json.dumps(["doubao"]),
+            "status": status
+        })
+    
+    @pytest.mark.asyncio
+    async def test_stats_cache_miss_then_hit(self, async_db_session):
+        """测试未命中时计算并写入缓存，再次读取时命中缓存"""
+        repo = MentionRepository(async_db_session)
+        project_id = str(uuid.uuid4())
+        await self._create_check(repo, project_id)
+        
+        with patch.object(
+            repo, "_compute_brand_mention_stats", wraps=repo._compute_brand_mention_stats
+        ) as compute:
+            first = await repo.get_brand_mention_stats(project_id, "TestBrand", days=30)
+            second = await repo.get_brand_mention_stats(project_id, "TestBrand", days=30)
+        
+        assert compute.call_count == 1
+        assert first == second
+        assert first["total_checks"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_cache_is_ignored(self, async_db_session):
+        """测试过期缓存不会被读取"""
+        repo = MentionRepository(async_db_session)
+        cache_key = f"brand_stats:{uuid.uuid4()}:TestBrand:30d"
+        
+        await repo.set_cached_analytics(cache_key, {"total_checks": 1}, ttl=timedelta(seconds=-1))
+        assert await repo.get_cached_analytics(cache_key) is None
+        
+        await repo.set_cached_analytics(cache_key, {"total_checks": 2})
+        assert await repo.get_cached_analytics(cache_key) == {"total_checks": 2}
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_insert_same_key(self, async_db_session):
+        """测试另一请求已写入相同cache_key时，写入变为更新而不是唯一约束错误"""
+        repo = MentionRepository(async_db_session)
+        project_id = str(uuid.uuid4())
+        cache_key = f"brand_stats:{project_id}:TestBrand:30d"
+        
+        # 模拟并发请求在本次读取未命中之后抢先写入
+        async_db_session.add(AnalyticsCache(
+            cache_key=cache_key,
+            project_id=project_id,
+            data=json.dumps({"total_checks": 1}),
+            expires_at=datetime.utcnow() + timedelta(minutes=10)
+        ))
+        await async_db_session.flush()
+        
+        await repo.set_cached_analytics(cache_key, {"total_checks": 2}, project_id=project_id)
+        
+        rows = (await async_db_session.execute(
+            select(AnalyticsCache.data).where(AnalyticsCache.cache_key == cache_key)
+        )).scalars().all()
+        assert rows == [json.dumps({"total_checks": 2})]
+    
+    @pytest.mark.asyncio
+    async def test_check_changes_invalidate_stats(self, async_db_session):
+        """测试新增检测记录和更新检测状态会清除项目的统计缓存"""
+        repo = MentionRepository(async_db_session)
+        project_id = str(uuid.uuid4())
+        check = await self._create_check(repo, project_id, status="running")
+        
+        stats = await repo.get_brand_mention_stats(project_id, "TestBrand", days=30)
+        assert stats["total_checks"] == 1
+        
+        # 新增检测记录后重新计算
+        await self._create_check(repo, project_id)
+        stats = await repo.get_brand_mention_stats(project_id, "TestBrand", days=30)
+        assert stats["total_checks"] == 2
+        
+        # 检测完成后缓存被清除
+        await repo.update_check_status(check.id, "completed")
+        cache_key = f"brand_stats:{project_id}:TestBrand:30d"
+        assert await repo.get_cached_analytics(cache_key) is None
@@ -8,6 +8,7 @@
 """
 
 import pytest
+from fastapi.responses import ORJSONResponse
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 from datetime import datetime
@@ -15,7 +16,7 @@ from datetime import datetime
 from app.main import app
 from app.core.deps import get_current_user
 from app.models.user import User
-from app.api.v1.mention_detection import MentionCheckResponse, ModelResult, BrandMention
+from app.api.v1.mention_detection import MentionCheckResponse, ModelResult, BrandMention, router
 
 
 # 创建测试用户函数
@@ -377,6 +378,15 @@ class TestMentionDetectionAPI:
         response = authenticated_client.get("/api/v1/api/analytics/compare")
         
         assert response.status_code == 422
+    
+    def test_orjson_response_routes(self):
+        """测试只有历史、统计和对比接口使用orjson序列化"""
+        orjson_paths = {
+            route.path for route in router.routes
+            if route.response_class is ORJSONResponse
+        }
+        
+        assert orjson_paths == {"/get-history", "/analytics/mentions", "/analytics/compare"}
 
 
 class TestMentionDetectionAPIErrorHandling:
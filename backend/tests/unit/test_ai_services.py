@@ -13,6 +13,15 @@ from app.services.ai import (
 )
 
 
+@pytest.fixture
+def mock_http_client():
+    """模拟httpx.AsyncClient，返回async with中得到的客户端实例"""
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_client_instance = AsyncMock()
+        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        yield mock_client_instance
+
+
 class TestAIServiceFactory:
     """AI服务工厂测试"""
     
@@ -120,8 +129,7 @@ class TestDoubaoProvider:
             await provider.chat_completion(messages, model="invalid-model")
     
     @pytest.mark.asyncio
-    @patch('httpx.AsyncClient')
-    async def test_chat_completion_success(self, mock_client):
+    async def test_chat_completion_success(self, mock_http_client):
         """测试成功的聊天完成"""
         # 模拟HTTP响应
         mock_response = MagicMock()
@@ -139,9 +147,7 @@ class TestDoubaoProvider:
         }
         mock_response.raise_for_status.return_value = None
         
-        mock_client_instance = AsyncMock()
-        mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_http_client.post.return_value = mock_response
         
         provider = DoubaoProvider("test-key")
         messages = [AIMessage(role=AIRole.USER, content="Test message")]
@@ -152,24 +158,23 @@ class TestDoubaoProvider:
         assert response.provider == "doubao"
         assert response.usage["total_tokens"] == 15
         assert response.metadata["response_id"] == "test-id"
+        mock_http_client.post.assert_awaited_once()
     
     @pytest.mark.asyncio
-    @patch('httpx.AsyncClient')
-    async def test_chat_completion_http_error(self, mock_client):
+    async def test_chat_completion_http_error(self, mock_http_client):
         """测试HTTP错误"""
         import httpx
         
-        mock_client_instance = AsyncMock()
-        mock_client_instance.post.side_effect = httpx.HTTPStatusError(
+        mock_http_client.post.side_effect = httpx.HTTPStatusError(
             "HTTP Error", request=MagicMock(), response=MagicMock(status_code=400, text="Bad Request")
         )
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
         
         provider = DoubaoProvider("test-key")
         messages = [AIMessage(role=AIRole.USER, content="Test")]
         
         with pytest.raises(AIError, match="HTTP 400"):
             await provider.chat_completion(messages)
+        mock_http_client.post.assert_awaited_once()
 
 
 class TestDeepSeekProvider:
@@ -189,8 +194,7 @@ class TestDeepSeekProvider:
             DeepSeekProvider("")
     
     @pytest.mark.asyncio
-    @patch('httpx.AsyncClient')
-    async def test_chat_completion_with_reasoning(self, mock_client):
+    async def test_chat_completion_with_reasoning(self, mock_http_client):
         """测试带推理过程的聊天完成"""
         # 模拟HTTP响应
         mock_response = MagicMock()
@@ -212,9 +216,7 @@ class TestDeepSeekProvider:
         }
         mock_response.raise_for_status.return_value = None
         
-        mock_client_instance = AsyncMock()
-        mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_http_client.post.return_value = mock_response
         
         provider = DeepSeekProvider("test-key")
         messages = [AIMessage(role=AIRole.USER, content="Test message")]
@@ -225,6 +227,7 @@ class TestDeepSeekProvider:
         assert response.provider == "deepseek"
         assert response.metadata["reasoning_content"] == "Reasoning process"
         assert response.metadata["created"] == 1234567890
+        mock_http_client.post.assert_awaited_once()
 
 
 class TestAIMessage:
@@ -5,12 +5,34 @@ import pytest
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.models.project import Project
 from app.services.project import ProjectService
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.schemas.common import PaginationParams
 from tests.conftest import ProjectFactory
 
 
+def bulk_create_projects(db_session: Session, user_id, projects: list) -> None:
+    """Insert projects for listing tests in one flush, bypassing the service."""
+    db_session.bulk_save_objects([
+        Project(user_id=user_id, **{"target_keywords": [], **fields})
+        for fields in projects
+    ])
+    db_session.commit()
+
+
+@pytest.fixture
+def seeded_projects(db_session: Session, test_user):
+    """Shared dataset for the listing, filter, search and stats tests."""
+    bulk_create_projects(db_session, test_user.id, [
+        {"name": "Search Test", "domain": "search.com",
+         "target_keywords": ["keyword1", "keyword2"]},
+        {"name": "Another Project", "domain": "another.com",
+         "target_keywords": ["keyword3"], "is_active": False},
+        *({"name": f"Project {i}", "domain": f"project{i}.com"} for i in range(3)),
+    ])
+
+
 class TestProjectService:
     """Test project service."""
     
@@ -45,13 +67,8 @@ class TestProjectService:
         assert exc_info.value.status_code == 400
         assert "Project with this domain already exists" in exc_info.value.detail
     
-    def test_create_project_same_domain_different_user(self, db_session: Session, test_user, test_project, auth_service):
+    def test_create_project_same_domain_different_user(self, db_session: Session, test_user, test_project, another_user):
         """Test project creation with same domain for different user."""
-        # Create another user
-        from tests.conftest import UserFactory
-        user_data = UserFactory.create_user_data(email="another@example.com")
-        another_user = auth_service.create_user(user_data)
-        
         project_service = ProjectService(db_session)
         project_data = ProjectFactory.create_project_data(domain=test_project.domain)
         
@@ -83,13 +100,8 @@ class TestProjectService:
         
         assert project is None
     
-    def test_get_project_by_id_wrong_user(self, db_session: Session, test_project, auth_service):
+    def test_get_project_by_id_wrong_user(self, db_session: Session, test_project, another_user):
         """Test getting project by ID with wrong user."""
-        # Create another user
-        from tests.conftest import UserFactory
-        user_data = UserFactory.create_user_data(email="another@example.com")
-        another_user = auth_service.create_user(user_data)
-        
         project_service = ProjectService(db_session)
         
         project = project_service.get_project_by_id(
@@ -147,116 +159,45 @@ class TestProjectService:
         deleted_project = db_session.query(Project).filter_by(id=project_id).first()
         assert deleted_project is None
     
-    def test_get_user_projects_pagination(self, db_session: Session, test_user, auth_service):
-        """Test getting user projects with pagination."""
-        project_service = ProjectService(db_session)
-        
-        # Create multiple projects
-        for i in range(5):
-            project_data = ProjectFactory.create_project_data(
-                name=f"Project {i}",
-                domain=f"project{i}.com"
-            )
-            project_service.create_project(project_data, str(test_user.id))
-        
-        # Test pagination
-        pagination = PaginationParams(page=1, per_page=3)
-        projects, total = project_service.get_user_projects(str(test_user.id), pagination)
-        
-        assert len(projects) == 3
-        assert total == 5
-        
-        # Test second page
-        pagination = PaginationParams(page=2, per_page=3)
-        projects, total = project_service.get_user_projects(str(test_user.id), pagination)
-        
-        assert len(projects) == 2
-        assert total == 5
-    
-    def test_get_user_projects_filter_active(self, db_session: Session, test_user, auth_service):
-        """Test getting user projects filtered by active status."""
-        project_service = ProjectService(db_session)
-        
-        # Create active and inactive projects
-        active_data = ProjectFactory.create_project_data(name="Active", domain="active.com")
-        active_project = project_service.create_project(active_data, str(test_user.id))
-        
-        inactive_data = ProjectFactory.create_project_data(name="Inactive", domain="inactive.com")
-        inactive_project = project_service.create_project(inactive_data, str(test_user.id))
-        inactive_project.is_active = False
-        db_session.commit()
-        
-        pagination = PaginationParams(page=1, per_page=10)
-        
-        # Test active filter
-        projects, total = project_service.get_user_projects(
-            str(test_user.id), pagination, is_active=True
-        )
-        assert total == 1
-        assert projects[0].is_active is True
-        
-        # Test inactive filter
-        projects, total = project_service.get_user_projects(
-            str(test_user.id), pagination, is_active=False
-        )
-        assert total == 1
-        assert projects[0].is_active is False
-    
-    def test_get_user_projects_search(self, db_session: Session, test_user, auth_service):
-        """Test getting user projects with search."""
+    @pytest.mark.parametrize("page, per_page, filters, expected_count, expected_total", [
+        (1, 3, {}, 3, 5),
+        (2, 3, {}, 2, 5),
+        (1, 10, {"is_active": True}, 4, 4),
+        (1, 10, {"is_active": False}, 1, 1),
+        (1, 10, {"search": "Search"}, 1, 1),
+        (1, 10, {"search": "another"}, 1, 1),
+    ])
+    def test_get_user_projects(
+        self, db_session: Session, test_user, seeded_projects,
+        page, per_page, filters, expected_count, expected_total
+    ):
+        """Test getting user projects with pagination, status filter and search."""
         project_service = ProjectService(db_session)
+        pagination = PaginationParams(page=page, per_page=per_page)
         
-        # Create projects with different names and domains
-        project_data1 = ProjectFactory.create_project_data(name="Search Test", domain="search.com")
-        project_service.create_project(project_data1, str(test_user.id))
-        
-        project_data2 = ProjectFactory.create_project_data(name="Another Project", domain="another.com")
-        project_service.create_project(project_data2, str(test_user.id))
-        
-        pagination = PaginationParams(page=1, per_page=10)
-        
-        # Search by name
         projects, total = project_service.get_user_projects(
-            str(test_user.id), pagination, search="Search"
+            str(test_user.id), pagination, **filters
         )
-        assert total == 1
-        assert "Search" in projects[0].name
         
-        # Search by domain
-        projects, total = project_service.get_user_projects(
-            str(test_user.id), pagination, search="another"
-        )
-        assert total == 1
-        assert "another" in projects[0].domain
+        assert len(projects) == expected_count
+        assert total == expected_total
+        if "is_active" in filters:
+            assert all(p.is_active is filters["is_active"] for p in projects)
+        if "search" in filters:
+            term = filters["search"].lower()
+            assert all(term in p.name.lower() or term in p.domain for p in projects)
     
-    def test_get_project_stats(self, db_session: Session, test_user, auth_service):
+    def test_get_project_stats(self, db_session: Session, test_user, seeded_projects):
         """Test getting project statistics."""
         project_service = ProjectService(db_session)
         
-        # Create projects with different statuses and keywords
-        active_data = ProjectFactory.create_project_data(
-            name="Active",
-            domain="active.com",
-            target_keywords=["keyword1", "keyword2"]
-        )
-        active_project = project_service.create_project(active_data, str(test_user.id))
-        
-        inactive_data = ProjectFactory.create_project_data(
-            name="Inactive",
-            domain="inactive.com",
-            target_keywords=["keyword3"]
-        )
-        inactive_project = project_service.create_project(inactive_data, str(test_user.id))
-        inactive_project.is_active = False
-        db_session.commit()
-        
         stats = project_service.get_project_stats(str(test_user.id))
         
-        assert stats["total_projects"] == 2
-        assert stats["active_projects"] == 1
+        assert stats["total_projects"] == 5
+        assert stats["active_projects"] == 4
         assert stats["inactive_projects"] == 1
         assert stats["total_keywords"] == 3
-        assert stats["avg_keywords_per_project"] == 1.5
+        assert stats["avg_keywords_per_project"] == 0.6
     
     def test_toggle_project_status(self, db_session: Session, test_project):
         """Test toggling project status."""
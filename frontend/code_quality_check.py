@@ -7,16 +7,77 @@ GeoLens Frontend 代码质量检查脚本
 import os
 import re
 import ast
+import io
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Set, Optional, Tuple, Iterator, TextIO
 import json
 
+# 文本检查用的正则，模块级预编译
+TODO_PATTERN = re.compile(r'#\s*(TODO|FIXME|XXX)', re.IGNORECASE)
+PRINT_PATTERN = re.compile(r'\bprint\s*\(')
+
+# 计入圈复杂度的决策节点
+DECISION_NODES = (ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.And, ast.Or)
+
+# 路径中包含这些子串的文件/目录不参与分析
+SKIP_PATTERNS = (
+    '__pycache__',
+    '.git',
+    'venv',
+    'env',
+    '.pytest_cache',
+    'test_',
+    '__init__.py'
+)
+
+# 文件数超过该阈值时才启用进程池，小项目的进程启动开销大于收益
+PARALLEL_MIN_FILES = 32
+
+def _has_docstring(node: ast.AST) -> bool:
+    """
+    检查函数/类是否有非空文档字符串
+    
+    直接判断首条语句是否为非空白的字符串常量，省去 ast.get_docstring 的缩进清理。
+    只含空白的文档字符串按缺失处理。
+    """
+    body = node.body
+    if not body:
+        return False
+    first = body[0]
+    if not (isinstance(first, ast.Expr)
+            and isinstance(first.value, ast.Constant)
+            and isinstance(first.value.value, str)):
+        return False
+    return bool(first.value.value.strip())
+
+# 问题记录字段，顺序即JSON输出中的键顺序
+ISSUE_FIELDS = (
+    'type', 'file', 'file_name', 'line', 'function', 'class_name',
+    'length', 'complexity', 'duplicate_file', 'duplicate_line', 'message', 'severity'
+)
+
+class Issue(namedtuple('Issue', ISSUE_FIELDS, defaults=(None,) * len(ISSUE_FIELDS))):
+    """代码问题记录，大型项目中问题条目很多，用元组代替字典减少内存占用"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（省略未设置的字段），用于JSON输出"""
+        return {
+            ('class' if field == 'class_name' else field): value
+            for field, value in zip(self._fields, self)
+            if value is not None
+        }
+
 class CodeQualityAnalyzer:
     """代码质量分析器"""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, max_workers: Optional[int] = None):
         self.project_root = Path(project_root)
+        self.max_workers = max_workers
         self.issues = []
+        self.severity_counts = Counter()
         self.metrics = {
             'total_files': 0,
             'total_lines': 0,
@@ -32,82 +93,152 @@ class CodeQualityAnalyzer:
         """分析整个项目"""
         print("🔍 开始代码质量分析...")
         
-        # 获取所有Python文件
-        python_files = list(self.project_root.glob("**/*.py"))
+        # 获取所有需要分析的Python文件（跳过的目录在遍历时直接剪枝）
+        python_files = list(self._iter_python_files(self.project_root))
         self.metrics['total_files'] = len(python_files)
         
-        for file_path in python_files:
-            if self._should_skip_file(file_path):
-                continue
-                
-            self._analyze_file(file_path)
+        if self.max_workers == 1 or len(python_files) < PARALLEL_MIN_FILES:
+            for file_path in python_files:
+                self._analyze_file(file_path)
+        else:
+            # 各文件分析相互独立，分发到进程池后按原顺序合并结果
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(analyze_file, python_files, chunksize=16)
+                for file_metrics, file_issues in results:
+                    for key, value in file_metrics.items():
+                        self.metrics[key] += value
+                    self.issues.extend(file_issues)
         
         # 检查重复代码
         self._check_code_duplication(python_files)
         
+        # 按严重程度计数一次，建议生成和报告共用
+        self.severity_counts = Counter(issue.severity for issue in self.issues)
+        
         return {
             'metrics': self.metrics,
             'issues': self.issues,
+            'severity_counts': dict(self.severity_counts),
             'recommendations': self._generate_recommendations()
         }
     
+    def _iter_python_files(self, directory: Path) -> Iterator[Path]:
+        """
+        按目录先序遍历Python文件，顺序与 glob("**/*.py") 一致
+        
+        跳过规则是路径子串匹配，目录命中时其下所有文件都会被跳过，
+        因此直接剪枝整个目录，不再枚举 venv、.git 等目录中的文件。
+        """
+        try:
+            with os.scandir(directory) as scandir_it:
+                entries = list(scandir_it)
+        except PermissionError:
+            return
+        
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            
+            path = directory / entry.name
+            if is_dir:
+                if not self._should_skip_file(path):
+                    subdirectories.append(path)
+            elif entry.name.endswith('.py') and not self._should_skip_file(entry.name):
+                # 所在目录已通过检查，且跳过规则不含路径分隔符，只需检查文件名
+                yield path
+        
+        for subdirectory in subdirectories:
+            yield from self._iter_python_files(subdirectory)
+    
     def _should_skip_file(self, file_path: Path) -> bool:
         """检查是否应该跳过文件"""
-        skip_patterns = [
-            '__pycache__',
-            '.git',
-            'venv',
-            'env',
-            '.pytest_cache',
-            'test_',
-            '__init__.py'
-        ]
-        
-        return any(pattern in str(file_path) for pattern in skip_patterns)
+        path_str = str(file_path)
+        return any(pattern in path_str for pattern in SKIP_PATTERNS)
     
     def _analyze_file(self, file_path: Path):
         """分析单个文件"""
+        # 路径字符串和文件名每个文件只计算一次，所有问题记录共用
+        file_str = str(file_path)
+        file_name = file_path.name
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = file_path.read_text(encoding='utf-8')
             
-            # 基本指标
+            # 基本指标（按行切分一次，文本分析复用）
             lines = content.split('\n')
             self.metrics['total_lines'] += len(lines)
             
             # AST分析
             try:
                 tree = ast.parse(content)
-                self._analyze_ast(tree, file_path)
+                self._analyze_ast(tree, file_str, file_name)
             except SyntaxError as e:
-                self.issues.append({
-                    'type': 'syntax_error',
-                    'file': str(file_path),
-                    'line': e.lineno,
-                    'message': f"语法错误: {e.msg}",
-                    'severity': 'error'
-                })
+                self.issues.append(Issue(
+                    type='syntax_error',
+                    file=file_str,
+                    file_name=file_name,
+                    line=e.lineno,
+                    message=f"语法错误: {e.msg}",
+                    severity='error'
+                ))
             
             # 文本分析
-            self._analyze_text(content, file_path)
+            self._analyze_text(lines, file_str, file_name)
             
         except Exception as e:
-            self.issues.append({
-                'type': 'file_error',
-                'file': str(file_path),
-                'message': f"文件分析失败: {str(e)}",
-                'severity': 'warning'
-            })
+            self.issues.append(Issue(
+                type='file_error',
+                file=file_str,
+                file_name=file_name,
+                message=f"文件分析失败: {str(e)}",
+                severity='warning'
+            ))
     
-    def _analyze_ast(self, tree: ast.AST, file_path: Path):
+    def _analyze_ast(self, tree: ast.AST, file_str: str, file_name: str):
         """分析AST"""
-        for node in ast.walk(tree):
+        for node, complexity in self._collect_definitions(tree):
             if isinstance(node, ast.FunctionDef):
-                self._analyze_function(node, file_path)
+                self._analyze_function(node, file_str, file_name, complexity)
+            else:
+                self._analyze_class(node, file_str, file_name)
+    
+    def _collect_definitions(self, tree: ast.AST) -> List[tuple]:
+        """
+        单次遍历AST，收集函数/类定义并同时累计函数复杂度
+        
+        决策节点计入所有外层函数（与对每个函数单独ast.walk的结果一致），
+        返回顺序与ast.walk的广度优先顺序相同。
+        """
+        definitions = []  # [深度, 先序序号, 节点, 复杂度]
+        stack = [(tree, 0, ())]
+        order = 0
+        
+        while stack:
+            node, depth, open_functions = stack.pop()
+            
+            if isinstance(node, DECISION_NODES):
+                for entry in open_functions:
+                    entry[3] += 1
+            
+            if isinstance(node, ast.FunctionDef):
+                entry = [depth, order, node, 1]  # 基础复杂度
+                definitions.append(entry)
+                open_functions = open_functions + (entry,)
             elif isinstance(node, ast.ClassDef):
-                self._analyze_class(node, file_path)
+                definitions.append([depth, order, node, None])
+            
+            order += 1
+            children = list(ast.iter_child_nodes(node))
+            for child in reversed(children):
+                stack.append((child, depth + 1, open_functions))
+        
+        definitions.sort(key=lambda entry: (entry[0], entry[1]))
+        return [(node, complexity) for _, _, node, complexity in definitions]
     
-    def _analyze_function(self, node: ast.FunctionDef, file_path: Path):
+    def _analyze_function(self, node: ast.FunctionDef, file_str: str, file_name: str,
+                          complexity: int):
         """分析函数"""
         self.metrics['total_functions'] += 1
         
@@ -116,146 +247,190 @@ class CodeQualityAnalyzer:
             func_length = node.end_lineno - node.lineno
             if func_length > 50:
                 self.metrics['long_functions'] += 1
-                self.issues.append({
-                    'type': 'long_function',
-                    'file': str(file_path),
-                    'line': node.lineno,
-                    'function': node.name,
-                    'length': func_length,
-                    'message': f"函数 '{node.name}' 过长 ({func_length} 行)",
-                    'severity': 'warning'
-                })
+                self.issues.append(Issue(
+                    type='long_function',
+                    file=file_str,
+                    file_name=file_name,
+                    line=node.lineno,
+                    function=node.name,
+                    length=func_length,
+                    message=f"函数 '{node.name}' 过长 ({func_length} 行)",
+                    severity='warning'
+                ))
         
         # 检查函数复杂度（简单的圈复杂度）
-        complexity = self._calculate_complexity(node)
         if complexity > 10:
             self.metrics['complex_functions'] += 1
-            self.issues.append({
-                'type': 'complex_function',
-                'file': str(file_path),
-                'line': node.lineno,
-                'function': node.name,
-                'complexity': complexity,
-                'message': f"函数 '{node.name}' 复杂度过高 ({complexity})",
-                'severity': 'warning'
-            })
+            self.issues.append(Issue(
+                type='complex_function',
+                file=file_str,
+                file_name=file_name,
+                line=node.lineno,
+                function=node.name,
+                complexity=complexity,
+                message=f"函数 '{node.name}' 复杂度过高 ({complexity})",
+                severity='warning'
+            ))
         
         # 检查文档字符串
-        if not ast.get_docstring(node):
+        if not _has_docstring(node):
             self.metrics['missing_docstrings'] += 1
-            self.issues.append({
-                'type': 'missing_docstring',
-                'file': str(file_path),
-                'line': node.lineno,
-                'function': node.name,
-                'message': f"函数 '{node.name}' 缺少文档字符串",
-                'severity': 'info'
-            })
+            self.issues.append(Issue(
+                type='missing_docstring',
+                file=file_str,
+                file_name=file_name,
+                line=node.lineno,
+                function=node.name,
+                message=f"函数 '{node.name}' 缺少文档字符串",
+                severity='info'
+            ))
     
-    def _analyze_class(self, node: ast.ClassDef, file_path: Path):
+    def _analyze_class(self, node: ast.ClassDef, file_str: str, file_name: str):
         """分析类"""
         self.metrics['total_classes'] += 1
         
         # 检查类文档字符串
-        if not ast.get_docstring(node):
-            self.issues.append({
-                'type': 'missing_docstring',
-                'file': str(file_path),
-                'line': node.lineno,
-                'class': node.name,
-                'message': f"类 '{node.name}' 缺少文档字符串",
-                'severity': 'info'
-            })
+        if not _has_docstring(node):
+            self.issues.append(Issue(
+                type='missing_docstring',
+                file=file_str,
+                file_name=file_name,
+                line=node.lineno,
+                class_name=node.name,
+                message=f"类 '{node.name}' 缺少文档字符串",
+                severity='info'
+            ))
     
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """计算函数复杂度"""
-        complexity = 1  # 基础复杂度
-        
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, (ast.And, ast.Or)):
-                complexity += 1
-        
-        return complexity
-    
-    def _analyze_text(self, content: str, file_path: Path):
+    def _analyze_text(self, lines: List[str], file_str: str, file_name: str):
         """文本分析"""
-        lines = content.split('\n')
+        add_issue = self.issues.append
+        # 大多数文件没有超长行，先整体取一次最大行长，没有时跳过逐行长度检查
+        check_long_lines = max(map(len, lines), default=0) > 120
         
         for i, line in enumerate(lines, 1):
             # 检查行长度
-            if len(line) > 120:
-                self.issues.append({
-                    'type': 'long_line',
-                    'file': str(file_path),
-                    'line': i,
-                    'length': len(line),
-                    'message': f"行过长 ({len(line)} 字符)",
-                    'severity': 'info'
-                })
+            if check_long_lines and len(line) > 120:
+                line_length = len(line)
+                add_issue(Issue(
+                    type='long_line',
+                    file=file_str,
+                    file_name=file_name,
+                    line=i,
+                    length=line_length,
+                    message=f"行过长 ({line_length} 字符)",
+                    severity='info'
+                ))
             
-            # 检查TODO/FIXME注释
-            if re.search(r'#\s*(TODO|FIXME|XXX)', line, re.IGNORECASE):
-                self.issues.append({
-                    'type': 'todo_comment',
-                    'file': str(file_path),
-                    'line': i,
-                    'message': "发现TODO/FIXME注释",
-                    'severity': 'info'
-                })
+            # 检查TODO/FIXME注释（先用子串判断，不含'#'的行无需正则）
+            if '#' in line and TODO_PATTERN.search(line):
+                add_issue(Issue(
+                    type='todo_comment',
+                    file=file_str,
+                    file_name=file_name,
+                    line=i,
+                    message="发现TODO/FIXME注释",
+                    severity='info'
+                ))
             
             # 检查print语句（可能是调试代码）
-            if re.search(r'\bprint\s*\(', line) and 'logger' not in line:
-                self.issues.append({
-                    'type': 'debug_print',
-                    'file': str(file_path),
-                    'line': i,
-                    'message': "发现print语句，建议使用日志",
-                    'severity': 'info'
-                })
+            if 'print' in line and PRINT_PATTERN.search(line) and 'logger' not in line:
+                add_issue(Issue(
+                    type='debug_print',
+                    file=file_str,
+                    file_name=file_name,
+                    line=i,
+                    message="发现print语句，建议使用日志",
+                    severity='info'
+                ))
     
     def _check_code_duplication(self, python_files: List[Path]):
         """检查代码重复"""
         # 简单的重复代码检测
         code_blocks = {}
         
+        # python_files 已由 _iter_python_files 过滤，无需再次检查跳过规则
         for file_path in python_files:
-            if self._should_skip_file(file_path):
-                continue
-                
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     lines = f.readlines()
                 
+                file_str = str(file_path)
+                file_name = file_path.name
+                
                 # 检查连续的5行代码
-                for i in range(len(lines) - 4):
-                    block = ''.join(lines[i:i+5]).strip()
-                    if len(block) > 100:  # 只检查有意义的代码块
-                        block_hash = hash(block)
-                        
-                        if block_hash in code_blocks:
-                            self.metrics['duplicated_code_blocks'] += 1
-                            self.issues.append({
-                                'type': 'code_duplication',
-                                'file': str(file_path),
-                                'line': i + 1,
-                                'duplicate_file': code_blocks[block_hash]['file'],
-                                'duplicate_line': code_blocks[block_hash]['line'],
-                                'message': "发现重复代码块",
-                                'severity': 'warning'
-                            })
-                        else:
-                            code_blocks[block_hash] = {
-                                'file': str(file_path),
-                                'line': i + 1
-                            }
+                for i, block_hash in self._iter_block_hashes(lines):
+                    if block_hash in code_blocks:
+                        self.metrics['duplicated_code_blocks'] += 1
+                        self.issues.append(Issue(
+                            type='code_duplication',
+                            file=file_str,
+                            file_name=file_name,
+                            line=i + 1,
+                            duplicate_file=code_blocks[block_hash]['file'],
+                            duplicate_line=code_blocks[block_hash]['line'],
+                            message="发现重复代码块",
+                            severity='warning'
+                        ))
+                    else:
+                        code_blocks[block_hash] = {
+                            'file': file_str,
+                            'line': i + 1
+                        }
             
             except Exception:
                 continue
     
+    def _iter_block_hashes(self, lines: List[str], window: int = 5,
+                           min_length: int = 100) -> Iterator[Tuple[int, int]]:
+        """
+        生成每个窗口（连续window行）的代码块指纹
+        
+        等价于对 ''.join(lines[i:i+window]).strip() 取hash，但不拼接字符串：
+        strip只影响窗口内首个非空行的行首和最后一个非空行的行尾，
+        因此指纹由这两行的裁剪结果与中间原始行组成，长度由预先算好的行长累加得到。
+        每行只裁剪、哈希一次（字符串缓存自身hash），每个窗口只做常数次整数运算。
+        """
+        n = len(lines)
+        if n < window:
+            return
+        
+        stripped = [line.strip() for line in lines]
+        lstripped = [line.lstrip() for line in lines]
+        rstripped = [line.rstrip() for line in lines]
+        
+        # 前缀行长，用于计算中间行的总长度
+        prefix_lengths = [0] * (n + 1)
+        for i, line in enumerate(lines):
+            prefix_lengths[i + 1] = prefix_lengths[i] + len(line)
+        
+        # 每个位置向后/向前最近的非空行下标
+        next_nonblank = [n] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            next_nonblank[i] = i if stripped[i] else next_nonblank[i + 1]
+        prev_nonblank = [-1] * n
+        for i in range(n):
+            prev_nonblank[i] = i if stripped[i] else prev_nonblank[i - 1] if i else -1
+        
+        for i in range(n - window + 1):
+            first = next_nonblank[i]
+            last = prev_nonblank[i + window - 1]
+            if first > last:
+                continue  # 整个窗口都是空白行
+            
+            if first == last:
+                if len(stripped[first]) <= min_length:
+                    continue
+                yield i, hash((stripped[first],))
+                continue
+            
+            length = (len(lstripped[first])
+                      + prefix_lengths[last] - prefix_lengths[first + 1]
+                      + len(rstripped[last]))
+            if length <= min_length:  # 只检查有意义的代码块
+                continue
+            
+            yield i, hash((lstripped[first], *lines[first + 1:last], rstripped[last]))
+    
     def _generate_recommendations(self) -> List[str]:
         """生成改进建议"""
         recommendations = []
@@ -282,8 +457,8 @@ class CodeQualityAnalyzer:
             )
         
         # 基于问题类型生成建议
-        error_count = len([i for i in self.issues if i['severity'] == 'error'])
-        warning_count = len([i for i in self.issues if i['severity'] == 'warning'])
+        error_count = self.severity_counts['error']
+        warning_count = self.severity_counts['warning']
         
         if error_count > 0:
             recommendations.append(f"发现 {error_count} 个错误，需要立即修复")
@@ -293,75 +468,105 @@ class CodeQualityAnalyzer:
         
         return recommendations
 
+def analyze_file(file_path: Path) -> Tuple[Dict[str, int], List[Issue]]:
+    """
+    分析单个文件（进程池工作函数）
+    
+    Returns:
+        (该文件的指标增量, 该文件的问题列表)
+    """
+    analyzer = CodeQualityAnalyzer(str(file_path.parent))
+    analyzer._analyze_file(file_path)
+    return analyzer.metrics, analyzer.issues
+
 def generate_report(analysis_result: Dict[str, Any]) -> str:
     """生成分析报告"""
+    buffer = io.StringIO()
+    write_report(analysis_result, buffer)
+    return buffer.getvalue()[:-1]
+
+def write_report(analysis_result: Dict[str, Any], output: TextIO):
+    """逐行写出分析报告，不在内存中拼接完整报告"""
+    def emit(line: str = ""):
+        output.write(line)
+        output.write("\n")
+    
     metrics = analysis_result['metrics']
     issues = analysis_result['issues']
     recommendations = analysis_result['recommendations']
     
-    report = []
-    report.append("# 🔍 GeoLens Frontend 代码质量分析报告")
-    report.append("")
-    report.append("## 📊 代码指标")
-    report.append("")
-    report.append(f"- **总文件数**: {metrics['total_files']}")
-    report.append(f"- **总代码行数**: {metrics['total_lines']}")
-    report.append(f"- **函数数量**: {metrics['total_functions']}")
-    report.append(f"- **类数量**: {metrics['total_classes']}")
-    report.append("")
+    emit("# 🔍 GeoLens Frontend 代码质量分析报告")
+    emit()
+    emit("## 📊 代码指标")
+    emit()
+    emit(f"- **总文件数**: {metrics['total_files']}")
+    emit(f"- **总代码行数**: {metrics['total_lines']}")
+    emit(f"- **函数数量**: {metrics['total_functions']}")
+    emit(f"- **类数量**: {metrics['total_classes']}")
+    emit()
     
     # 质量指标
-    report.append("## 🎯 质量指标")
-    report.append("")
-    report.append(f"- **过长函数**: {metrics['long_functions']}")
-    report.append(f"- **复杂函数**: {metrics['complex_functions']}")
-    report.append(f"- **缺少文档**: {metrics['missing_docstrings']}")
-    report.append(f"- **重复代码块**: {metrics['duplicated_code_blocks']}")
-    report.append("")
+    emit("## 🎯 质量指标")
+    emit()
+    emit(f"- **过长函数**: {metrics['long_functions']}")
+    emit(f"- **复杂函数**: {metrics['complex_functions']}")
+    emit(f"- **缺少文档**: {metrics['missing_docstrings']}")
+    emit(f"- **重复代码块**: {metrics['duplicated_code_blocks']}")
+    emit()
     
     # 问题统计
-    error_count = len([i for i in issues if i['severity'] == 'error'])
-    warning_count = len([i for i in issues if i['severity'] == 'warning'])
-    info_count = len([i for i in issues if i['severity'] == 'info'])
+    severity_counts = analysis_result.get('severity_counts')
+    if severity_counts is None:
+        severity_counts = Counter(issue.severity for issue in issues)
+    error_count = severity_counts.get('error', 0)
+    warning_count = severity_counts.get('warning', 0)
+    info_count = severity_counts.get('info', 0)
     
-    report.append("## 🚨 问题统计")
-    report.append("")
-    report.append(f"- **错误**: {error_count}")
-    report.append(f"- **警告**: {warning_count}")
-    report.append(f"- **信息**: {info_count}")
-    report.append("")
+    emit("## 🚨 问题统计")
+    emit()
+    emit(f"- **错误**: {error_count}")
+    emit(f"- **警告**: {warning_count}")
+    emit(f"- **信息**: {info_count}")
+    emit()
     
     # 主要问题
     if issues:
-        report.append("## 🔧 主要问题")
-        report.append("")
+        emit("## 🔧 主要问题")
+        emit()
+        
+        # 按严重程度分组，只收集每组前10个（只显示前10个），总数取自计数
+        shown_issues = {'error': [], 'warning': []}
+        for issue in issues:
+            group = shown_issues.get(issue.severity)
+            if group is not None and len(group) < 10:
+                group.append(issue)
         
-        # 按严重程度分组
         for severity in ['error', 'warning']:
-            severity_issues = [i for i in issues if i['severity'] == severity]
+            severity_issues = shown_issues[severity]
+            severity_total = severity_counts.get(severity, 0)
             if severity_issues:
                 severity_name = "错误" if severity == 'error' else "警告"
-                report.append(f"### {severity_name}")
-                report.append("")
+                emit(f"### {severity_name}")
+                emit()
                 
-                for issue in severity_issues[:10]:  # 只显示前10个
-                    file_name = Path(issue['file']).name
-                    line = issue.get('line', '?')
-                    message = issue['message']
-                    report.append(f"- **{file_name}:{line}** - {message}")
+                for issue in severity_issues:
+                    file_name = issue.file_name or Path(issue.file).name
+                    line = issue.line if issue.line is not None else '?'
+                    message = issue.message
+                    emit(f"- **{file_name}:{line}** - {message}")
                 
-                if len(severity_issues) > 10:
-                    report.append(f"- ... 还有 {len(severity_issues) - 10} 个{severity_name}")
+                if severity_total > 10:
+                    emit(f"- ... 还有 {severity_total - 10} 个{severity_name}")
                 
-                report.append("")
+                emit()
     
     # 改进建议
     if recommendations:
-        report.append("## 💡 改进建议")
-        report.append("")
+        emit("## 💡 改进建议")
+        emit()
         for i, rec in enumerate(recommendations, 1):
-            report.append(f"{i}. {rec}")
-        report.append("")
+            emit(f"{i}. {rec}")
+        emit()
     
     # 总体评分
     total_issues = len(issues)
@@ -369,21 +574,19 @@ def generate_report(analysis_result: Dict[str, Any]) -> str:
     
     if total_functions > 0:
         quality_score = max(0, 100 - (total_issues / total_functions * 10))
-        report.append("## 📈 质量评分")
-        report.append("")
-        report.append(f"**总体质量评分**: {quality_score:.1f}/100")
-        report.append("")
+        emit("## 📈 质量评分")
+        emit()
+        emit(f"**总体质量评分**: {quality_score:.1f}/100")
+        emit()
         
         if quality_score >= 90:
-            report.append("✅ **优秀** - 代码质量很高")
+            emit("✅ **优秀** - 代码质量很高")
         elif quality_score >= 80:
-            report.append("🟡 **良好** - 代码质量较好，有改进空间")
+            emit("🟡 **良好** - 代码质量较好，有改进空间")
         elif quality_score >= 70:
-            report.append("🟠 **一般** - 代码质量一般，建议改进")
+            emit("🟠 **一般** - 代码质量一般，建议改进")
         else:
-            report.append("🔴 **需要改进** - 代码质量较差，需要重点改进")
-    
-    return "\n".join(report)
+            emit("🔴 **需要改进** - 代码质量较差，需要重点改进")
 
 def main():
     """主函数"""
@@ -394,13 +597,10 @@ def main():
     analyzer = CodeQualityAnalyzer(".")
     result = analyzer.analyze_project()
     
-    # 生成报告
-    report = generate_report(result)
-    
-    # 保存报告
+    # 生成并保存报告
     report_file = Path("code_quality_report.md")
     with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+        write_report(result, f)
     
     # 输出摘要
     print("\n📊 分析完成！")
@@ -413,7 +613,9 @@ def main():
     # 保存JSON数据
     json_file = Path("code_quality_data.json")
     with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+        # 问题数量较多时缩进会使文件体积和写出时间成倍增加，使用紧凑格式
+        json_result = dict(result, issues=[issue.to_dict() for issue in result['issues']])
+        json.dump(json_result, f, ensure_ascii=False, separators=(',', ':'), default=str)
     
     print(f"📊 数据文件: {json_file}")
 
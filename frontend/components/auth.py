@@ -3,13 +3,63 @@
 处理用户登录、注册和认证状态管理
 """
 
+import atexit
+import threading
 import streamlit as st
 import httpx
+import orjson
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from utils.config import get_config
-from utils.session import set_auth_data, clear_auth_data, is_token_expired, get_auth_headers
+from utils.session import set_auth_data, clear_auth_data, is_token_expired, get_auth_headers, update_user_data
+
+def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+    """解析响应体（orjson直接解析原始字节，每个响应只解析一次）"""
+    return orjson.loads(response.content)
+
+def try_demo_login(email: str, password: str) -> bool:
+    """
+    演示账号登录
+    
+    不依赖配置和HTTP客户端，登录表单可在创建认证管理器之前先尝试。
+    
+    Returns:
+        是否为演示账号（是则已写入认证数据）
+    """
+    if email != "demo@geolens.ai" or password != "demo123":
+        return False
+    
+    # 模拟用户数据
+    user_data = {
+        "id": "demo-user-id",
+        "email": "demo@geolens.ai",
+        "full_name": "演示用户",
+        "is_active": True,
+        "subscription_plan": "free"
+    }
+    
+    # 模拟token
+    access_token = "demo-access-token"
+    refresh_token = "demo-refresh-token"
+    
+    # 设置认证数据
+    set_auth_data(access_token, refresh_token, user_data, expires_in=3600)
+    
+    return True
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """获取共享的HTTP客户端，连接池在脚本重跑和会话之间复用，避免每次请求重新握手"""
+    config = get_config()
+    client = httpx.Client(
+        # 连接阶段快速失败，读取阶段保留配置的超时以容纳较慢的接口
+        timeout=httpx.Timeout(connect=3.0, read=config.api_timeout, write=5.0, pool=1.0),
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        headers={"User-Agent": "GeoLens-Frontend"}
+    )
+    atexit.register(client.close)
+    return client
 
 class AuthManager:
     """认证管理器"""
@@ -17,54 +67,40 @@ class AuthManager:
     def __init__(self):
         self.config = get_config()
         self.api_base_url = self.config.api_base_url
+        self.client = get_http_client()
     
     def login(self, email: str, password: str) -> bool:
         """用户登录"""
         try:
             # 演示模式 - 直接成功
-            if email == "demo@geolens.ai" and password == "demo123":
-                # 模拟用户数据
-                user_data = {
-                    "id": "demo-user-id",
-                    "email": "demo@geolens.ai",
-                    "full_name": "演示用户",
-                    "is_active": True,
-                    "subscription_plan": "free"
-                }
-                
-                # 模拟token
-                access_token = "demo-access-token"
-                refresh_token = "demo-refresh-token"
-                
-                # 设置认证数据
-                set_auth_data(access_token, refresh_token, user_data, expires_in=3600)
-                
+            if try_demo_login(email, password):
                 return True
             
             # 真实API调用
             login_url = self.config.get_api_url("auth/login")
             
-            with httpx.Client(timeout=self.config.api_timeout) as client:
-                response = client.post(
-                    login_url,
-                    json={"email": email, "password": password}
+            response = self.client.post(
+                login_url,
+                json={"email": email, "password": password}
+            )
+            
+            payload = _parse_response(response)
+            
+            if response.status_code == 200:
+                data = payload["data"]
+                
+                # 设置认证数据
+                set_auth_data(
+                    access_token=data["access_token"],
+                    refresh_token=data["refresh_token"],
+                    user_data=data["user"],
+                    expires_in=data.get("expires_in", 3600)
                 )
                 
-                if response.status_code == 200:
-                    data = response.json()["data"]
-                    
-                    # 设置认证数据
-                    set_auth_data(
-                        access_token=data["access_token"],
-                        refresh_token=data["refresh_token"],
-                        user_data=data["user"],
-                        expires_in=data.get("expires_in", 3600)
-                    )
-                    
-                    return True
-                else:
-                    st.error(f"登录失败: {response.json().get('detail', '未知错误')}")
-                    return False
+                return True
+            else:
+                st.error(f"登录失败: {payload.get('detail', '未知错误')}")
+                return False
                     
         except httpx.TimeoutException:
             st.error("❌ 请求超时，请检查网络连接")
@@ -87,23 +123,22 @@ class AuthManager:
         try:
             register_url = self.config.get_api_url("auth/register")
             
-            with httpx.Client(timeout=self.config.api_timeout) as client:
-                response = client.post(
-                    register_url,
-                    json={
-                        "email": email,
-                        "password": password,
-                        "full_name": full_name
-                    }
-                )
-                
-                if response.status_code == 200:
-                    st.success("✅ 注册成功！请使用新账号登录")
-                    return True
-                else:
-                    error_msg = response.json().get('detail', '注册失败')
-                    st.error(f"❌ {error_msg}")
-                    return False
+            response = self.client.post(
+                register_url,
+                json={
+                    "email": email,
+                    "password": password,
+                    "full_name": full_name
+                }
+            )
+            
+            if response.status_code == 200:
+                st.success("✅ 注册成功！请使用新账号登录")
+                return True
+            else:
+                error_msg = _parse_response(response).get('detail', '注册失败')
+                st.error(f"❌ {error_msg}")
+                return False
                     
         except Exception as e:
             st.error(f"❌ 注册过程中发生错误: {str(e)}")
@@ -117,6 +152,11 @@ class AuthManager:
         if not st.session_state.access_token:
             return False
         
+        # 令牌未过期时直接通过，不进入刷新流程
+        expires_at = st.session_state.token_expires_at
+        if expires_at and expires_at > datetime.now():
+            return True
+        
         # 检查token是否过期
         if is_token_expired():
             # 尝试刷新token
@@ -138,31 +178,58 @@ class AuthManager:
                 st.session_state.token_expires_at = datetime.now() + timedelta(hours=1)
                 return True
             
-            # 真实API调用
-            refresh_url = self.config.get_api_url("auth/refresh")
+            # 真实API调用：同一会话中并发的刷新只发出一次请求，其余调用等待其结果
+            inflight = st.session_state.setdefault('_refresh_inflight', {
+                'lock': threading.Lock(),
+                'event': None,
+                'result': False
+            })
             
-            with httpx.Client(timeout=self.config.api_timeout) as client:
-                response = client.post(
-                    refresh_url,
-                    json={"refresh_token": st.session_state.refresh_token}
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()["data"]
-                    
-                    # 更新访问令牌
-                    st.session_state.access_token = data["access_token"]
-                    st.session_state.token_expires_at = datetime.now() + timedelta(
-                        seconds=data.get("expires_in", 3600)
-                    )
-                    
-                    return True
-                else:
-                    return False
+            with inflight['lock']:
+                event = inflight['event']
+                is_owner = event is None
+                if is_owner:
+                    event = inflight['event'] = threading.Event()
+            
+            if not is_owner:
+                event.wait(timeout=self.config.api_timeout)
+                return inflight['result']
+            
+            result = False
+            try:
+                result = self._request_token_refresh()
+                return result
+            finally:
+                with inflight['lock']:
+                    inflight['result'] = result
+                    inflight['event'] = None
+                event.set()
                     
         except Exception:
             return False
     
+    def _request_token_refresh(self) -> bool:
+        """调用刷新接口并更新会话中的访问令牌"""
+        refresh_url = self.config.get_api_url("auth/refresh")
+        
+        response = self.client.post(
+            refresh_url,
+            json={"refresh_token": st.session_state.refresh_token}
+        )
+        
+        if response.status_code == 200:
+            data = _parse_response(response)["data"]
+            
+            # 更新访问令牌
+            st.session_state.access_token = data["access_token"]
+            st.session_state.token_expires_at = datetime.now() + timedelta(
+                seconds=data.get("expires_in", 3600)
+            )
+            
+            return True
+        else:
+            return False
+    
     def get_current_user(self) -> Optional[Dict[str, Any]]:
         """获取当前用户信息"""
         if not self.is_authenticated():
@@ -179,29 +246,35 @@ class AuthManager:
             update_url = self.config.get_api_url("auth/me")
             headers = get_auth_headers()
             
-            with httpx.Client(timeout=self.config.api_timeout) as client:
-                response = client.put(
-                    update_url,
-                    json=profile_data,
-                    headers=headers
-                )
+            response = self.client.put(
+                update_url,
+                json=profile_data,
+                headers=headers
+            )
+            
+            payload = _parse_response(response)
+            
+            if response.status_code == 200:
+                # 更新会话中的用户数据
+                updated_user = payload["data"]
+                update_user_data(updated_user)
                 
-                if response.status_code == 200:
-                    # 更新会话中的用户数据
-                    updated_user = response.json()["data"]
-                    st.session_state.user.update(updated_user)
-                    
-                    st.success("✅ 用户资料更新成功")
-                    return True
-                else:
-                    error_msg = response.json().get('detail', '更新失败')
-                    st.error(f"❌ {error_msg}")
-                    return False
+                st.success("✅ 用户资料更新成功")
+                return True
+            else:
+                error_msg = payload.get('detail', '更新失败')
+                st.error(f"❌ {error_msg}")
+                return False
                     
         except Exception as e:
             st.error(f"❌ 更新过程中发生错误: {str(e)}")
             return False
 
+@st.cache_resource
+def get_auth_manager() -> AuthManager:
+    """获取共享的认证管理器（实例只持有配置和HTTP客户端，会话数据都在session_state中）"""
+    return AuthManager()
+
 def show_login_form():
     """显示登录表单"""
     st.markdown("### 🔐 用户登录")
@@ -218,8 +291,7 @@ def show_login_form():
     
     if login_button:
         if email and password:
-            auth_manager = AuthManager()
-            if auth_manager.login(email, password):
+            if try_demo_login(email, password) or get_auth_manager().login(email, password):
                 st.success("✅ 登录成功！")
                 st.rerun()
         else:
@@ -248,14 +320,14 @@ def show_register_form():
         elif len(password) < 6:
             st.error("❌ 密码长度至少6位")
         else:
-            auth_manager = AuthManager()
+            auth_manager = get_auth_manager()
             if auth_manager.register(email, password, full_name):
                 st.success("✅ 注册成功！请使用新账号登录")
 
 def require_auth(func):
     """认证装饰器"""
     def wrapper(*args, **kwargs):
-        auth_manager = AuthManager()
+        auth_manager = get_auth_manager()
         if not auth_manager.is_authenticated():
             st.error("❌ 请先登录")
             st.stop()
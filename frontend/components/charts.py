@@ -4,12 +4,11 @@
 """
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-from typing import List, Dict, Any, Optional
-import numpy as np
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
 
 from utils.cache_manager import cached
 from utils.error_handler import error_handler, handle_error
@@ -24,11 +23,25 @@ def render_detection_results_chart(brand_mentions: List[Dict[str, Any]]):
         return
 
     with PerformanceTimer("Detection Results Chart Render", "chart_performance"):
-        # 转换为DataFrame
-        df = pd.DataFrame(brand_mentions)
+        fig, fig_confidence = _build_detection_results_figures(brand_mentions)
     
     # 品牌提及率柱状图
     st.markdown("#### 📊 品牌提及率分析")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # 置信度分布图
+    if fig_confidence is not None:
+        st.markdown("#### 🎯 置信度分布")
+        st.plotly_chart(fig_confidence, use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_detection_results_figures(brand_mentions: List[Dict[str, Any]]) -> Tuple['go.Figure', Optional['go.Figure']]:
+    """构建检测结果图表（品牌提及柱状图和置信度分布图），输入不变时跨重跑复用"""
+    import pandas as pd
+    import plotly.express as px
+
+    # 转换为DataFrame
+    df = pd.DataFrame(brand_mentions)
     
     # 按品牌统计提及次数
     brand_stats = df.groupby('brand').agg({
@@ -56,12 +69,9 @@ def render_detection_results_chart(brand_mentions: List[Dict[str, Any]]):
         yaxis_title="提及次数"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
-    
     # 置信度分布图
+    fig_confidence = None
     if len(df) > 1:
-        st.markdown("#### 🎯 置信度分布")
-        
         fig_confidence = px.histogram(
             df,
             x='confidence_score',
@@ -71,7 +81,8 @@ def render_detection_results_chart(brand_mentions: List[Dict[str, Any]]):
         )
         
         fig_confidence.update_layout(height=300)
-        st.plotly_chart(fig_confidence, use_container_width=True)
+    
+    return fig, fig_confidence
 
 def render_model_comparison_chart(model_results: List[Dict[str, Any]]):
     """渲染模型对比图表"""
@@ -80,18 +91,43 @@ def render_model_comparison_chart(model_results: List[Dict[str, Any]]):
         return
     
     st.markdown("#### 🤖 AI模型性能对比")
+    st.plotly_chart(_build_model_comparison_figure(model_results), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_model_comparison_figure(model_results: List[Dict[str, Any]]) -> 'go.Figure':
+    """构建模型对比图表"""
+    import pandas as pd
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # 准备数据：所有模型的提及展开为一张表，一次分组计算各模型的平均置信度
+    # （按结果序号分组，保持模型顺序；没有提及的模型置信度记为0）
+    mention_scores = pd.DataFrame(
+        [
+            (index, mention['confidence_score'])
+            for index, result in enumerate(model_results)
+            for mention in result.get('mentions', [])
+        ],
+        columns=['result_index', 'confidence_score']
+    )
+    avg_confidence = (
+        mention_scores.groupby('result_index')['confidence_score'].mean()
+        .reindex(range(len(model_results)), fill_value=0)
+    )
     
-    # 准备数据
-    model_data = []
-    for result in model_results:
-        model_data.append({
-            '模型': result['model'].title(),
-            '处理时间(ms)': result.get('processing_time_ms', 0),
-            '检测到品牌数': len(result.get('mentions', [])),
-            '平均置信度': np.mean([m['confidence_score'] for m in result.get('mentions', [])]) if result.get('mentions') else 0
-        })
-    
-    df_models = pd.DataFrame(model_data)
+    # 一次遍历生成整行记录，显式指定列类型，省去pandas的类型推断
+    df_models = pd.DataFrame.from_records(
+        [
+            (
+                result['model'].title(),
+                result.get('processing_time_ms', 0),
+                len(result.get('mentions', [])),
+                confidence
+            )
+            for result, confidence in zip(model_results, avg_confidence.to_numpy())
+        ],
+        columns=['模型', '处理时间(ms)', '检测到品牌数', '平均置信度']
+    ).astype({'处理时间(ms)': 'float64', '检测到品牌数': 'int64', '平均置信度': 'float64'})
     
     # 创建子图
     fig = make_subplots(
@@ -147,7 +183,23 @@ def render_model_comparison_chart(model_results: List[Dict[str, Any]]):
     fig.update_yaxes(title_text="检测到品牌数", row=1, col=2)
     fig.update_yaxes(title_text="平均置信度", secondary_y=True, row=1, col=2)
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _prepare_time_frame(records: List[Dict[str, Any]]) -> 'pd.DataFrame':
+    """
+    将按日期的记录转换为按日期排序的DataFrame
+    
+    日期只解析一次并缓存，趋势图和时间序列图使用同一份数据时共享解析结果；
+    稳定排序保证折线按时间顺序连接。
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    
+    # 确保日期格式正确
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date', kind='stable', ignore_index=True)
 
 def render_brand_trend_chart(trend_data: List[Dict[str, Any]], brands: List[str]):
     """渲染品牌趋势图表"""
@@ -156,9 +208,15 @@ def render_brand_trend_chart(trend_data: List[Dict[str, Any]], brands: List[str]
         return
     
     st.markdown("#### 📈 品牌提及趋势")
-    
+    st.plotly_chart(_build_brand_trend_figure(trend_data), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_brand_trend_figure(trend_data: List[Dict[str, Any]]) -> 'go.Figure':
+    """构建品牌趋势图表"""
+    import plotly.express as px
+
     # 转换数据格式
-    df_trend = pd.DataFrame(trend_data)
+    df_trend = _prepare_time_frame(trend_data)
     
     # 创建折线图
     fig = px.line(
@@ -176,7 +234,7 @@ def render_brand_trend_chart(trend_data: List[Dict[str, Any]], brands: List[str]
         yaxis_title="提及率 (%)"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_confidence_radar_chart(brand_data: List[Dict[str, Any]]):
     """渲染置信度雷达图"""
@@ -185,26 +243,33 @@ def render_confidence_radar_chart(brand_data: List[Dict[str, Any]]):
         return
     
     st.markdown("#### 🎯 品牌检测置信度雷达图")
-    
-    # 准备雷达图数据
-    brands = list(set([item['brand'] for item in brand_data]))
-    models = list(set([item['model'] for item in brand_data]))
+    st.plotly_chart(_build_confidence_radar_figure(brand_data), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_confidence_radar_figure(brand_data: List[Dict[str, Any]]) -> 'go.Figure':
+    """构建置信度雷达图"""
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    # 准备雷达图数据（按首次出现顺序去重，重跑之间坐标轴顺序保持稳定）
+    df = pd.DataFrame(brand_data, columns=['brand', 'model', 'confidence_score'])
+    brands = df['brand'].unique().tolist()
+    models = df['model'].unique().tolist()
+    
+    # 一次透视得到 品牌×模型 置信度矩阵：同一组合取第一条记录，缺失组合记为0
+    score_matrix = (
+        df.drop_duplicates(subset=['brand', 'model'], keep='first')
+        .set_index(['brand', 'model'])['confidence_score']
+        .unstack()
+        .reindex(index=brands, columns=models)
+        .fillna(0)
+    )
     
     fig = go.Figure()
     
-    for brand in brands:
-        brand_scores = []
-        for model in models:
-            # 找到对应的置信度
-            score = 0
-            for item in brand_data:
-                if item['brand'] == brand and item['model'] == model:
-                    score = item.get('confidence_score', 0)
-                    break
-            brand_scores.append(score)
-        
+    for brand, brand_scores in score_matrix.iterrows():
         fig.add_trace(go.Scatterpolar(
-            r=brand_scores,
+            r=brand_scores.tolist(),
             theta=models,
             fill='toself',
             name=brand
@@ -221,7 +286,7 @@ def render_confidence_radar_chart(brand_data: List[Dict[str, Any]]):
         height=500
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_comparison_heatmap(comparison_data: Dict[str, Any]):
     """渲染对比热力图"""
@@ -240,6 +305,14 @@ def render_comparison_heatmap(comparison_data: Dict[str, Any]):
         st.info("📊 暂无矩阵数据")
         return
     
+    st.plotly_chart(_build_comparison_heatmap_figure(matrix, models, brands), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_comparison_heatmap_figure(matrix: List[List[float]], models: List[str],
+                                     brands: List[str]) -> 'go.Figure':
+    """构建对比热力图"""
+    import plotly.express as px
+
     # 创建热力图
     fig = px.imshow(
         matrix,
@@ -256,7 +329,7 @@ def render_comparison_heatmap(comparison_data: Dict[str, Any]):
         yaxis_title="品牌"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_metrics_dashboard(metrics: Dict[str, Any]):
     """渲染指标仪表板"""
@@ -298,10 +371,14 @@ def render_time_series_chart(time_data: List[Dict[str, Any]], metric: str = 'men
         st.info("📅 暂无时间序列数据")
         return
     
-    df = pd.DataFrame(time_data)
-    
-    # 确保日期格式正确
-    df['date'] = pd.to_datetime(df['date'])
+    st.plotly_chart(_build_time_series_figure(time_data, metric), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_time_series_figure(time_data: List[Dict[str, Any]], metric: str) -> 'go.Figure':
+    """构建时间序列图表"""
+    import plotly.express as px
+
+    df = _prepare_time_frame(time_data)
     
     # 创建时间序列图
     fig = px.line(
@@ -318,7 +395,7 @@ def render_time_series_chart(time_data: List[Dict[str, Any]], metric: str = 'men
         yaxis_title=metric.replace("_", " ").title()
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_distribution_chart(data: List[float], title: str, x_label: str):
     """渲染分布图表"""
@@ -326,17 +403,43 @@ def render_distribution_chart(data: List[float], title: str, x_label: str):
         st.info(f"📊 暂无{title}数据")
         return
     
-    # 创建直方图
-    fig = px.histogram(
-        x=data,
-        nbins=20,
+    fig = _build_distribution_figure(data, title, x_label)
+    if fig is None:
+        st.info(f"📊 暂无{title}数据")
+        return
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_distribution_figure(data: List[float], title: str, x_label: str) -> Optional['go.Figure']:
+    """构建分布图表，没有有效数值时返回None"""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    # None和NaN转换后都是NaN，分箱前去掉非有限值
+    values = np.asarray(data, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None
+    
+    # 预先分箱，只把20个柱的计数交给Plotly，而不是全部原始数据
+    counts, edges = np.histogram(values, bins=20)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color='#636efa'
+    ))
+    fig.update_layout(
         title=title,
-        labels={'x': x_label, 'count': '频次'}
+        xaxis_title=x_label,
+        yaxis_title='频次',
+        bargap=0
     )
     
     # 添加统计信息
-    mean_val = np.mean(data)
-    median_val = np.median(data)
+    mean_val = values.mean()
+    median_val = np.median(values)
     
     fig.add_vline(x=mean_val, line_dash="dash", line_color="red", 
                   annotation_text=f"平均值: {mean_val:.2f}")
@@ -344,7 +447,7 @@ def render_distribution_chart(data: List[float], title: str, x_label: str):
                   annotation_text=f"中位数: {median_val:.2f}")
     
     fig.update_layout(height=300)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_pie_chart(data: Dict[str, int], title: str):
     """渲染饼图"""
@@ -352,6 +455,13 @@ def render_pie_chart(data: Dict[str, int], title: str):
         st.info(f"🥧 暂无{title}数据")
         return
     
+    st.plotly_chart(_build_pie_figure(data, title), use_container_width=True)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_pie_figure(data: Dict[str, int], title: str) -> 'go.Figure':
+    """构建饼图"""
+    import plotly.express as px
+
     # 创建饼图
     fig = px.pie(
         values=list(data.values()),
@@ -360,7 +470,7 @@ def render_pie_chart(data: Dict[str, int], title: str):
     )
     
     fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_scatter_plot(x_data: List[float], y_data: List[float], 
                        labels: List[str], title: str, x_label: str, y_label: str):
@@ -369,6 +479,17 @@ def render_scatter_plot(x_data: List[float], y_data: List[float],
         st.info(f"📍 暂无{title}数据")
         return
     
+    st.plotly_chart(
+        _build_scatter_figure(x_data, y_data, labels, title, x_label, y_label),
+        use_container_width=True
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_scatter_figure(x_data: List[float], y_data: List[float], labels: List[str],
+                          title: str, x_label: str, y_label: str) -> 'go.Figure':
+    """构建散点图"""
+    import plotly.express as px
+
     # 创建散点图
     fig = px.scatter(
         x=x_data,
@@ -381,4 +502,4 @@ def render_scatter_plot(x_data: List[float], y_data: List[float],
     fig.update_traces(textposition='top center')
     fig.update_layout(height=400)
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
@@ -3,10 +3,16 @@
 应用导航和用户信息显示
 """
 
+import httpx
 import streamlit as st
-from components.auth import AuthManager
+from functools import lru_cache
+from typing import Optional
+from components.auth import get_auth_manager, get_http_client
 from utils.config import get_config, show_config_debug
-from utils.session import show_session_debug
+from utils.session import show_session_debug, get_cache_count
+
+# 健康检查只用于侧边栏状态展示，超时要短，避免后端不可用时阻塞页面渲染
+HEALTH_CHECK_TIMEOUT = httpx.Timeout(3.0, connect=2.0)
 
 def render_sidebar():
     """渲染侧边栏"""
@@ -40,20 +46,10 @@ def render_sidebar():
             st.markdown("---")
             render_debug_section()
 
-def render_user_info():
-    """渲染用户信息"""
-    auth_manager = AuthManager()
-    user = auth_manager.get_current_user()
-    
-    if user:
-        st.markdown("### 用户信息")
-        
-        # 用户头像和基本信息
-        col1, col2 = st.columns([1, 2])
-        with col1:
-            # 使用用户名首字母作为头像
-            initial = user.get('full_name', user.get('email', 'U'))[0].upper()
-            st.markdown(f"""
+@lru_cache(maxsize=64)
+def _avatar_html(initial: str) -> str:
+    """生成头像HTML，相同首字母复用已生成的片段"""
+    return f"""
             <div style="
                 width: 50px; 
                 height: 50px; 
@@ -67,7 +63,21 @@ def render_user_info():
                 font-size: 20px;
                 margin: 0 auto;
             ">{initial}</div>
-            """, unsafe_allow_html=True)
+            """
+
+def render_user_info():
+    """渲染用户信息"""
+    auth_manager = get_auth_manager()
+    user = auth_manager.get_current_user()
+    
+    if user:
+        st.markdown("### 用户信息")
+        
+        # 用户头像和基本信息
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            # 使用用户名首字母作为头像
+            st.markdown(_avatar_html(st.session_state.user_initial), unsafe_allow_html=True)
         
         with col2:
             st.markdown(f"""
@@ -80,32 +90,40 @@ def render_user_info():
         if st.button("登出", key="logout_btn", use_container_width=True):
             auth_manager.logout()
 
+# 主要功能页面
+NAVIGATION_PAGES = [
+    {"name": "首页", "file": "main.py", "description": "概览和快速操作"},
+    {"name": "项目管理", "file": "pages/2_📁_Projects.py", "description": "管理检测项目"},
+    {"name": "引用检测", "file": "pages/3_🔍_Detection.py", "description": "核心检测功能"},
+    {"name": "检测历史", "file": "pages/4_📜_History.py", "description": "历史记录查看"},
+    {"name": "模板管理", "file": "pages/5_📚_Templates.py", "description": "Prompt模板库"},
+    {"name": "数据分析", "file": "pages/6_📊_Analytics.py", "description": "可视化分析"},
+    {"name": "个人资料", "file": "pages/7_👤_Profile.py", "description": "用户设置"}
+]
+NAVIGATION_FILES = {page["name"]: page["file"] for page in NAVIGATION_PAGES}
+
+def _on_navigation_change():
+    """记录导航目标，回调中不能切换页面，由本次重跑在渲染导航时执行"""
+    st.session_state._nav_target = NAVIGATION_FILES.get(st.session_state.nav_radio)
+
 def render_navigation():
     """渲染导航菜单"""
     st.markdown("### 功能导航")
 
-    # 主要功能页面
-    pages = [
-        {"name": "首页", "file": "main.py", "description": "概览和快速操作"},
-        {"name": "项目管理", "file": "pages/2_📁_Projects.py", "description": "管理检测项目"},
-        {"name": "引用检测", "file": "pages/3_🔍_Detection.py", "description": "核心检测功能"},
-        {"name": "检测历史", "file": "pages/4_📜_History.py", "description": "历史记录查看"},
-        {"name": "模板管理", "file": "pages/5_📚_Templates.py", "description": "Prompt模板库"},
-        {"name": "数据分析", "file": "pages/6_📊_Analytics.py", "description": "可视化分析"},
-        {"name": "个人资料", "file": "pages/7_👤_Profile.py", "description": "用户设置"}
-    ]
+    # 单个单选组件代替逐页按钮，每次重跑只需处理一个导航组件
+    st.radio(
+        "功能导航",
+        list(NAVIGATION_FILES),
+        index=None,
+        captions=[page["description"] for page in NAVIGATION_PAGES],
+        key="nav_radio",
+        on_change=_on_navigation_change,
+        label_visibility="collapsed"
+    )
     
-    for page in pages:
-        if st.button(
-            page["name"], 
-            key=f"nav_{page['file']}", 
-            help=page["description"],
-            use_container_width=True
-        ):
-            if page["file"] == "main.py":
-                st.switch_page("main.py")
-            else:
-                st.switch_page(page["file"])
+    target = st.session_state.pop("_nav_target", None)
+    if target:
+        st.switch_page(target)
 
 def render_quick_actions():
     """渲染快速操作"""
@@ -147,6 +165,20 @@ def render_current_project():
         if st.button("📁 选择项目", key="select_project", use_container_width=True):
             st.switch_page("pages/2_📁_Projects.py")
 
+@st.cache_data(ttl=30, show_spinner=False)
+def probe_api_health(health_url: str) -> Optional[int]:
+    """
+    探测API健康状态，结果缓存30秒，避免每次重跑都发出阻塞请求
+    
+    Returns:
+        响应状态码，连接失败时返回None
+    """
+    try:
+        response = get_http_client().get(health_url, timeout=HEALTH_CHECK_TIMEOUT)
+        return response.status_code
+    except Exception:
+        return None
+
 def render_system_status():
     """渲染系统状态"""
     st.markdown("### 🔧 系统状态")
@@ -154,15 +186,12 @@ def render_system_status():
     # API连接状态
     config = get_config()
     
-    try:
-        import httpx
-        with httpx.Client(timeout=5) as client:
-            response = client.get(f"{config.api_base_url.replace('/api/v1', '')}/health")
-            if response.status_code == 200:
-                st.success("🟢 API连接正常")
-            else:
-                st.warning("🟡 API响应异常")
-    except:
+    status_code = probe_api_health(f"{config.api_base_url.replace('/api/v1', '')}/health")
+    if status_code == 200:
+        st.success("🟢 API连接正常")
+    elif status_code is not None:
+        st.warning("🟡 API响应异常")
+    else:
         st.error("🔴 API连接失败")
     
     # 会话状态
@@ -172,11 +201,7 @@ def render_system_status():
         st.error("🔴 用户未认证")
     
     # 缓存状态
-    cache_count = (
-        len(st.session_state.get('projects_cache', {})) +
-        len(st.session_state.get('templates_cache', {})) +
-        len(st.session_state.get('history_cache', {}))
-    )
+    cache_count = get_cache_count()
     st.info(f"💾 缓存项目: {cache_count}")
 
 def render_debug_section():
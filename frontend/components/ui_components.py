@@ -3,7 +3,11 @@
 提供专业、简洁的企业级用户界面组件
 """
 
+import hashlib
+import html
+import operator
 import streamlit as st
+from functools import lru_cache, reduce
 from typing import List, Dict, Any, Optional, Callable
 import pandas as pd
 from datetime import datetime
@@ -39,19 +43,24 @@ def render_action_buttons(actions: List[Dict[str, Any]], columns: int = 3):
     
     return results
 
+INFO_CARD_COLORS = {
+    'info': '#e3f2fd',
+    'success': '#e8f5e8',
+    'warning': '#fff3e0',
+    'error': '#ffebee'
+}
+
 def render_info_card(title: str, content: str, icon: str = "ℹ️", 
                     card_type: str = "info"):
     """渲染信息卡片"""
-    type_colors = {
-        'info': '#e3f2fd',
-        'success': '#e8f5e8',
-        'warning': '#fff3e0',
-        'error': '#ffebee'
-    }
-    
-    color = type_colors.get(card_type, type_colors['info'])
+    color = INFO_CARD_COLORS.get(card_type, INFO_CARD_COLORS['info'])
     
-    st.markdown(f"""
+    st.markdown(_info_card_html(title, content, icon, color), unsafe_allow_html=True)
+
+@lru_cache(maxsize=128)
+def _info_card_html(title: str, content: str, icon: str, color: str) -> str:
+    """生成信息卡片HTML，相同参数复用已生成的片段"""
+    return f"""
     <div style="
         background-color: {color};
         padding: 1rem;
@@ -62,7 +71,7 @@ def render_info_card(title: str, content: str, icon: str = "ℹ️",
         <h4>{icon} {title}</h4>
         <p>{content}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 def render_data_table(data: List[Dict[str, Any]], 
                      title: Optional[str] = None,
@@ -77,25 +86,25 @@ def render_data_table(data: List[Dict[str, Any]],
         st.info("📝 暂无数据")
         return {}
     
-    df = pd.DataFrame(data)
+    df = _build_table_frame(data)
+    # 控件键由表格内容决定，重跑时重新构建的同一份数据仍对应同一组控件
+    table_key = hashlib.blake2b(repr(data).encode(), digest_size=8).hexdigest()
     
     # 搜索功能
     if searchable:
-        search_term = st.text_input("🔍 搜索", key=f"search_{id(data)}")
+        search_term = st.text_input("🔍 搜索", key=f"search_{table_key}")
         if search_term:
             # 简单的文本搜索
-            mask = df.astype(str).apply(
-                lambda x: x.str.contains(search_term, case=False, na=False)
-            ).any(axis=1)
-            df = df[mask]
+            df = df[_search_mask(df, search_term)]
     
     # 显示表格
     selected_rows = st.dataframe(
         df,
         use_container_width=True,
         hide_index=True,
-        on_select="rerun" if actions else None,
-        selection_mode="multi-row" if actions else None
+        key=f"table_{table_key}",
+        on_select="rerun" if actions else "ignore",
+        selection_mode="multi-row"
     )
     
     # 操作按钮
@@ -107,6 +116,22 @@ def render_data_table(data: List[Dict[str, Any]],
     
     return action_results
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_table_frame(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """构建表格DataFrame，数据不变时跨重跑复用，避免重复推断列类型"""
+    return pd.DataFrame(data)
+
+def _search_mask(df: pd.DataFrame, search_term: str) -> pd.Series:
+    """按纯文本（不区分大小写）在所有列中搜索，返回行掩码"""
+    masks = []
+    for column in df.columns:
+        values = df[column]
+        # 纯字符串列直接搜索，只有其他类型的列才转换为字符串
+        if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            values = values.astype(str)
+        masks.append(values.str.contains(search_term, case=False, regex=False, na=False))
+    return reduce(operator.or_, masks, pd.Series(False, index=df.index))
+
 def render_form_section(title: str, fields: List[Dict[str, Any]], 
                        form_key: str, submit_label: str = "提交"):
     """渲染表单部分"""
@@ -189,32 +214,45 @@ def render_progress_indicator(current_step: int, total_steps: int,
                 else:
                     st.markdown(f"⏳ {label}")
 
+DEFAULT_STATUS_CONFIG = {
+    'success': {'color': '#28a745', 'icon': '✅', 'text': '成功'},
+    'warning': {'color': '#ffc107', 'icon': '⚠️', 'text': '警告'},
+    'error': {'color': '#dc3545', 'icon': '❌', 'text': '错误'},
+    'info': {'color': '#17a2b8', 'icon': 'ℹ️', 'text': '信息'},
+    'pending': {'color': '#6c757d', 'icon': '⏳', 'text': '等待中'},
+    'running': {'color': '#007bff', 'icon': '🔄', 'text': '运行中'}
+}
+
 def render_status_badge(status: str, status_config: Optional[Dict[str, Dict]] = None):
     """渲染状态徽章"""
-    default_config = {
-        'success': {'color': '#28a745', 'icon': '✅', 'text': '成功'},
-        'warning': {'color': '#ffc107', 'icon': '⚠️', 'text': '警告'},
-        'error': {'color': '#dc3545', 'icon': '❌', 'text': '错误'},
-        'info': {'color': '#17a2b8', 'icon': 'ℹ️', 'text': '信息'},
-        'pending': {'color': '#6c757d', 'icon': '⏳', 'text': '等待中'},
-        'running': {'color': '#007bff', 'icon': '🔄', 'text': '运行中'}
-    }
-    
-    config = status_config or default_config
+    st.markdown(_status_badge_markup(status, status_config), unsafe_allow_html=True)
+
+def _status_badge_markup(status: str, status_config: Optional[Dict[str, Dict]] = None) -> str:
+    """按状态配置查找徽章HTML"""
+    config = status_config or DEFAULT_STATUS_CONFIG
     status_info = config.get(status, config.get('info', {}))
     
-    st.markdown(f"""
+    return _status_badge_html(
+        status_info.get('color', '#17a2b8'),
+        status_info.get('icon', 'ℹ️'),
+        status_info.get('text', status)
+    )
+
+@lru_cache(maxsize=128)
+def _status_badge_html(color: str, icon: str, text: str) -> str:
+    """生成状态徽章HTML，相同状态复用已生成的片段"""
+    return f"""
     <span style="
-        background-color: {status_info.get('color', '#17a2b8')};
+        background-color: {color};
         color: white;
         padding: 0.25rem 0.5rem;
         border-radius: 0.25rem;
         font-size: 0.875rem;
         font-weight: 500;
     ">
-        {status_info.get('icon', 'ℹ️')} {status_info.get('text', status)}
+        {icon} {text}
     </span>
-    """, unsafe_allow_html=True)
+    """
 
 def render_loading_spinner(message: str = "加载中..."):
     """渲染加载动画"""
@@ -255,7 +293,7 @@ def render_file_uploader(label: str, file_types: List[str],
         
         valid_files = []
         for file in uploaded_files:
-            file_size_mb = len(file.getvalue()) / (1024 * 1024)
+            file_size_mb = file.size / (1024 * 1024)
             if file_size_mb > max_size_mb:
                 st.error(f"文件 {file.name} 超过大小限制 ({file_size_mb:.1f}MB > {max_size_mb}MB)")
             else:
@@ -321,24 +359,29 @@ def render_key_value_pairs(data: Dict[str, Any], title: Optional[str] = None):
             st.markdown(str(value))
 
 def render_timeline(events: List[Dict[str, Any]]):
-    """渲染时间线"""
-    for i, event in enumerate(events):
-        timestamp = event.get('timestamp', '')
-        title = event.get('title', '')
-        description = event.get('description', '')
-        status = event.get('status', 'info')
-        
-        # 时间线连接线
-        if i > 0:
-            st.markdown("│")
-        
-        # 事件节点
-        col1, col2 = st.columns([1, 4])
-        with col1:
-            render_status_badge(status)
-        with col2:
-            st.markdown(f"**{title}**")
-            if description:
-                st.markdown(description)
-            if timestamp:
-                st.caption(timestamp)
+    """渲染时间线（所有事件拼接为一段HTML，一次输出）"""
+    if not events:
+        return
+    
+    events_html = "".join(_timeline_event_html(event) for event in events)
+    st.markdown(f'<ul class="timeline">{events_html}</ul>', unsafe_allow_html=True)
+
+def _timeline_event_html(event: Dict[str, Any]) -> str:
+    """生成单个时间线事件的HTML，布局由主题样式中的 .timeline-event 网格完成"""
+    timestamp = event.get('timestamp', '')
+    title = event.get('title', '')
+    description = event.get('description', '')
+    status = event.get('status', 'info')
+    
+    details = f'<div class="timeline-title">{_escape_text(title)}</div>'
+    if description:
+        details += f'<div class="timeline-description">{_escape_text(description)}</div>'
+    if timestamp:
+        details += f'<div class="timeline-time">{_escape_text(timestamp)}</div>'
+    
+    badge = _status_badge_markup(status).strip()
+    return f'<li class="timeline-event"><div>{badge}</div><div>{details}</div></li>'
+
+def _escape_text(value: Any) -> str:
+    """转义文本并将换行转为<br>，避免空行提前结束HTML块"""
+    return html.escape(str(value)).replace('\n', '<br>')
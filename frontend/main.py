@@ -6,19 +6,18 @@ AI引用检测平台前端应用
 import streamlit as st
 import sys
 import os
+import time
 from pathlib import Path
 
 # 添加项目路径到Python路径
 current_dir = Path(__file__).parent
 sys.path.append(str(current_dir))
 
-from components.auth import AuthManager
+from components.auth import get_auth_manager, try_demo_login
 from components.sidebar import render_sidebar
 from utils.config import load_config, get_config
 from utils.session import init_session_state
-from utils.error_handler import error_handler, handle_error, show_error_dashboard
-from utils.performance_monitor import monitor_page_load, show_performance_dashboard
-from utils.cache_manager import cache_stats
+from utils.error_handler import error_handler, handle_error
 from styles.enterprise_theme import apply_enterprise_theme, render_enterprise_header, render_metric_card
 
 # 页面配置
@@ -72,32 +71,36 @@ def show_login_page():
         st.markdown("---")
         st.markdown("### 用户登录")
 
-        with st.form("login_form"):
-            email = st.text_input("邮箱地址", placeholder="请输入您的邮箱")
-            password = st.text_input("密码", type="password", placeholder="请输入密码")
+        render_login_form()
 
-            col_login, col_register = st.columns(2)
-            with col_login:
-                login_button = st.form_submit_button("登录", type="primary")
-            with col_register:
-                register_button = st.form_submit_button("注册")
+        # 演示账号
+        render_demo_account_info()
 
-        # 处理登录
-        if login_button:
-            handle_login_attempt(email, password)
+@st.fragment
+def render_login_form():
+    """渲染登录表单（片段：提交时只重跑表单部分，登录成功后再整页重跑）"""
+    with st.form("login_form"):
+        email = st.text_input("邮箱地址", placeholder="请输入您的邮箱")
+        password = st.text_input("密码", type="password", placeholder="请输入密码")
 
-        # 处理注册
-        if register_button:
-            handle_register_attempt()
+        col_login, col_register = st.columns(2)
+        with col_login:
+            login_button = st.form_submit_button("登录", type="primary")
+        with col_register:
+            register_button = st.form_submit_button("注册")
 
-        # 演示账号
-        render_demo_account_info()
+    # 处理登录
+    if login_button:
+        handle_login_attempt(email, password)
+
+    # 处理注册
+    if register_button:
+        handle_register_attempt()
 
 def handle_login_attempt(email: str, password: str):
     """处理登录尝试"""
     if email and password:
-        auth_manager = AuthManager()
-        if auth_manager.login(email, password):
+        if try_demo_login(email, password) or get_auth_manager().login(email, password):
             st.success("✅ 登录成功！正在跳转...")
             st.rerun()
         else:
@@ -123,6 +126,9 @@ def render_demo_account_info():
 @error_handler(context={"page": "dashboard"})
 def show_main_app():
     """显示主应用"""
+    # 性能监控依赖psutil，只在进入主应用时导入，登录页不加载
+    from utils.performance_monitor import monitor_page_load
+
     # 监控页面加载性能
     monitor_page_load()
 
@@ -179,16 +185,28 @@ def show_main_app():
     st.markdown("---")
     st.markdown("### 最近活动")
     
-    # 模拟最近活动数据
+    recent_activities = _recent_activities_frame(int(time.time() // 60))
+    
+    st.dataframe(
+        recent_activities,
+        use_container_width=True,
+        hide_index=True
+    )
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _recent_activities_frame(minute_bucket: int):
+    """构建最近活动演示数据，按分钟缓存，时间列预先格式化为字符串"""
     import pandas as pd
     from datetime import datetime, timedelta
     
+    # 模拟最近活动数据
+    now = datetime.fromtimestamp(minute_bucket * 60)
     recent_activities = pd.DataFrame({
         '时间': [
-            datetime.now() - timedelta(hours=2),
-            datetime.now() - timedelta(hours=5),
-            datetime.now() - timedelta(days=1),
-            datetime.now() - timedelta(days=2),
+            now - timedelta(hours=2),
+            now - timedelta(hours=5),
+            now - timedelta(days=1),
+            now - timedelta(days=2),
         ],
         '活动': [
             '完成品牌检测: Notion vs Obsidian',
@@ -199,12 +217,8 @@ def show_main_app():
         '状态': ['成功', '成功', '成功', '成功'],
         '结果': ['提及率: 45%', '项目创建完成', '报告已下载', '模板已保存']
     })
-    
-    st.dataframe(
-        recent_activities,
-        use_container_width=True,
-        hide_index=True
-    )
+    recent_activities['时间'] = recent_activities['时间'].dt.strftime('%Y-%m-%d %H:%M')
+    return recent_activities
 
 def main():
     """主函数"""
@@ -216,10 +230,16 @@ def main():
         config = load_config()
 
         # 检查认证状态
-        auth_manager = AuthManager()
+        auth_manager = get_auth_manager()
 
         # 调试模式显示额外信息
         if config.debug:
+            # 调试面板只在调试模式下导入
+            from utils.error_handler import show_error_dashboard
+            from utils.performance_monitor import show_performance_dashboard
+            from utils.cache_manager import cache_stats
+            import orjson
+            
             with st.sidebar:
                 st.markdown("---")
                 st.markdown("### 🔧 调试信息")
@@ -236,7 +256,8 @@ def main():
                 if st.checkbox("显示缓存统计", key="show_cache"):
                     st.markdown("#### 📊 缓存统计")
                     stats = cache_stats()
-                    st.json(stats)
+                    # 预先用orjson序列化，st.json收到字符串时不再走标准库json编码
+                    st.json(orjson.dumps(stats, default=str).decode())
 
         if not auth_manager.is_authenticated():
             show_login_page()
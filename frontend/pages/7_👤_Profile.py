@@ -9,7 +9,7 @@ import plotly.express as px
 from datetime import datetime
 from typing import Dict, Any, List
 
-from components.auth import require_auth, AuthManager
+from components.auth import require_auth, get_auth_manager
 from components.sidebar import render_sidebar
 from utils.config import get_config
 from styles.enterprise_theme import apply_enterprise_theme, render_enterprise_header, render_status_badge
@@ -52,7 +52,7 @@ def render_profile_info():
     st.markdown("### 基本信息")
     
     # 获取当前用户信息
-    auth_manager = AuthManager()
+    auth_manager = get_auth_manager()
     user = auth_manager.get_current_user()
     
     if not user:
@@ -488,7 +488,7 @@ def render_security_settings():
 def update_profile(profile_data: Dict[str, Any]) -> bool:
     """更新个人资料"""
     try:
-        auth_manager = AuthManager()
+        auth_manager = get_auth_manager()
         return auth_manager.update_user_profile(profile_data)
     except Exception as e:
         st.error(f"更新失败: {str(e)}")
@@ -9,7 +9,7 @@ from datetime import datetime
 import asyncio
 
 from services.api_client import SyncAPIClient
-from utils.session import update_cache, get_cache
+from utils.session import update_cache, get_cache, remove_cache
 
 class DetectionService:
     """检测服务类"""
@@ -206,9 +206,7 @@ class DetectionService:
             response = self.api_client.delete(f"api/get-history/{check_id}")
             
             # 清除相关缓存
-            cache_key = f"detection_{check_id}"
-            if cache_key in st.session_state.get('history_cache', {}):
-                del st.session_state.history_cache[cache_key]
+            remove_cache(f"detection_{check_id}")
             
             return True
             
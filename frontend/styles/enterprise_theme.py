@@ -3,11 +3,11 @@
 参考Vercel、Salesforce等企业级应用的设计风格
 """
 
+import re
+
 import streamlit as st
 
-def apply_enterprise_theme():
-    """应用企业级主题样式"""
-    st.markdown("""
+_ENTERPRISE_CSS = """
     <style>
         /* 企业级色彩系统 */
         :root {
@@ -194,8 +194,51 @@ def apply_enterprise_theme():
             background: rgb(59 130 246 / 0.1);
             color: var(--info-color);
         }
+        
+        /* 时间线 */
+        .timeline {
+            list-style: none;
+            margin: 0;
+            padding: 0;
+        }
+        
+        .timeline-event {
+            display: grid;
+            grid-template-columns: 1fr 4fr;
+            gap: 1rem;
+            align-items: start;
+            padding: 0.75rem 0;
+        }
+        
+        .timeline-event + .timeline-event {
+            border-top: 1px solid var(--border-light);
+        }
+        
+        .timeline-title {
+            font-weight: 600;
+            color: var(--text-primary);
+        }
+        
+        .timeline-time {
+            font-size: 0.875rem;
+            color: var(--text-muted);
+        }
     </style>
-    """, unsafe_allow_html=True)
+"""
+
+def _compact_css(css: str) -> str:
+    """去掉注释和多余空白，减少每次重跑发送到前端的样式体积"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};])\s*', r'\1', css).strip()
+
+# 样式只在模块导入时压缩一次，所有会话和重跑共用
+_ENTERPRISE_STYLE = _compact_css(_ENTERPRISE_CSS)
+
+def apply_enterprise_theme():
+    """应用企业级主题样式"""
+    # 每次重跑都需要输出样式元素，否则Streamlit会移除上一轮的样式
+    st.markdown(_ENTERPRISE_STYLE, unsafe_allow_html=True)
 
 def render_enterprise_header(title: str, subtitle: str = ""):
     """渲染企业级页面标题"""
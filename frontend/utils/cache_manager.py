@@ -262,15 +262,17 @@ class CacheManager:
         
         return cache_info
 
-# 全局缓存管理器实例
-_cache_manager = None
+@st.cache_resource
+def _get_shared_cache_manager() -> CacheManager:
+    """全局共享的缓存管理器（缓存数据本身保存在各会话的session_state中）"""
+    return CacheManager()
 
 def get_cache_manager() -> CacheManager:
     """获取缓存管理器实例"""
-    global _cache_manager
-    if _cache_manager is None:
-        _cache_manager = CacheManager()
-    return _cache_manager
+    manager = _get_shared_cache_manager()
+    # 实例跨会话共享，每个会话首次访问时需要初始化自己的缓存存储
+    manager._init_cache_storage()
+    return manager
 
 # 便捷函数
 def cache_set(key: str, data: Any, ttl: Optional[int] = None) -> None:
@@ -3,62 +3,51 @@
 管理Streamlit会话状态和用户数据
 """
 
+import copy
 import streamlit as st
 from typing import Any, Dict, Optional
 from datetime import datetime, timedelta
 
-def init_session_state():
-    """初始化会话状态"""
-    
+# 会话状态默认值（可变对象在写入时复制，避免会话之间共享同一个对象）
+_SESSION_DEFAULTS = {
     # 认证相关
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-    
-    if 'access_token' not in st.session_state:
-        st.session_state.access_token = None
-    
-    if 'refresh_token' not in st.session_state:
-        st.session_state.refresh_token = None
-    
-    if 'token_expires_at' not in st.session_state:
-        st.session_state.token_expires_at = None
-    
-    if 'user' not in st.session_state:
-        st.session_state.user = {}
+    'authenticated': False,
+    'access_token': None,
+    'refresh_token': None,
+    'token_expires_at': None,
+    'user': {},
     
     # 应用状态
-    if 'current_project' not in st.session_state:
-        st.session_state.current_project = None
-    
-    if 'selected_brands' not in st.session_state:
-        st.session_state.selected_brands = []
-    
-    if 'selected_models' not in st.session_state:
-        st.session_state.selected_models = ["doubao", "deepseek"]
+    'current_project': None,
+    'selected_brands': [],
+    'selected_models': ["doubao", "deepseek"],
     
     # 缓存数据
-    if 'projects_cache' not in st.session_state:
-        st.session_state.projects_cache = {}
-    
-    if 'templates_cache' not in st.session_state:
-        st.session_state.templates_cache = {}
-    
-    if 'history_cache' not in st.session_state:
-        st.session_state.history_cache = {}
+    'projects_cache': {},
+    'templates_cache': {},
+    'history_cache': {},
     
     # UI状态
-    if 'sidebar_state' not in st.session_state:
-        st.session_state.sidebar_state = "expanded"
-    
-    if 'theme' not in st.session_state:
-        st.session_state.theme = "light"
+    'sidebar_state': "expanded",
+    'theme': "light",
     
     # 检测状态
-    if 'detection_running' not in st.session_state:
-        st.session_state.detection_running = False
+    'detection_running': False,
+    'last_detection_result': None,
+}
+
+def init_session_state():
+    """初始化会话状态（只写入缺失的键，不覆盖已有的值）"""
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.copy(default)
+    
+    # 依赖其他状态的派生字段
+    if 'user_initial' not in st.session_state:
+        st.session_state.user_initial = _user_initial(st.session_state.user)
     
-    if 'last_detection_result' not in st.session_state:
-        st.session_state.last_detection_result = None
+    if 'cache_item_count' not in st.session_state:
+        _update_cache_count()
 
 def set_auth_data(access_token: str, refresh_token: str, user_data: Dict[str, Any], expires_in: int = 3600):
     """设置认证数据"""
@@ -66,20 +55,32 @@ def set_auth_data(access_token: str, refresh_token: str, user_data: Dict[str, An
     st.session_state.access_token = access_token
     st.session_state.refresh_token = refresh_token
     st.session_state.user = user_data
+    st.session_state.user_initial = _user_initial(user_data)
     st.session_state.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
 
+def update_user_data(updates: Dict[str, Any]):
+    """更新会话中的用户数据"""
+    st.session_state.user.update(updates)
+    st.session_state.user_initial = _user_initial(st.session_state.user)
+
+def _user_initial(user_data: Dict[str, Any]) -> str:
+    """用户头像首字母，登录时计算一次，侧边栏直接读取"""
+    return (user_data.get('full_name') or user_data.get('email') or 'U')[0].upper()
+
 def clear_auth_data():
     """清除认证数据"""
     st.session_state.authenticated = False
     st.session_state.access_token = None
     st.session_state.refresh_token = None
     st.session_state.user = {}
+    st.session_state.user_initial = 'U'
     st.session_state.token_expires_at = None
     
     # 清除缓存数据
     st.session_state.projects_cache = {}
     st.session_state.templates_cache = {}
     st.session_state.history_cache = {}
+    _update_cache_count()
 
 def is_token_expired() -> bool:
     """检查token是否过期"""
@@ -115,6 +116,10 @@ def update_cache(cache_key: str, data: Any, ttl: int = 300):
         st.session_state.templates_cache[cache_key] = cache_data
     elif cache_key.startswith('history'):
         st.session_state.history_cache[cache_key] = cache_data
+    else:
+        return
+    
+    _update_cache_count()
 
 def get_cache(cache_key: str) -> Optional[Any]:
     """获取缓存数据"""
@@ -136,9 +141,33 @@ def get_cache(cache_key: str) -> Optional[Any]:
         else:
             # 删除过期缓存
             del cache_dict[cache_key]
+            _update_cache_count()
     
     return None
 
+def remove_cache(cache_key: str) -> bool:
+    """删除指定缓存数据"""
+    for cache_name in ('projects_cache', 'templates_cache', 'history_cache'):
+        cache_dict = st.session_state.get(cache_name, {})
+        if cache_key in cache_dict:
+            del cache_dict[cache_key]
+            _update_cache_count()
+            return True
+    
+    return False
+
+def get_cache_count() -> int:
+    """获取缓存条目总数（在缓存变更时维护，读取无需遍历缓存）"""
+    return st.session_state.get('cache_item_count', 0)
+
+def _update_cache_count():
+    """重新统计缓存条目总数，在修改缓存的函数中调用"""
+    st.session_state.cache_item_count = (
+        len(st.session_state.get('projects_cache', {})) +
+        len(st.session_state.get('templates_cache', {})) +
+        len(st.session_state.get('history_cache', {}))
+    )
+
 def clear_cache(cache_type: str = "all"):
     """清除缓存"""
     if cache_type == "all" or cache_type == "projects":
@@ -149,6 +178,8 @@ def clear_cache(cache_type: str = "all"):
     
     if cache_type == "all" or cache_type == "history":
         st.session_state.history_cache = {}
+    
+    _update_cache_count()
 
 def set_detection_state(running: bool, result: Optional[Dict[str, Any]] = None):
     """设置检测状态"""